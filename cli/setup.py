@@ -12,13 +12,14 @@ setup(
     packages=find_packages(where="src"),
     install_requires=[
         "typer[all]>=0.12.0",
-        "httpx>=0.27.0",
+        "httpx[http2]>=0.27.0",
         "playwright>=1.42.0",
         "pydantic-settings>=2.2.0",
         "jsonschema>=4.21.0",
         "rich>=13.7.0",
         "supabase>=2.4.0",
         "python-dotenv>=1.0.1",
+        "orjson>=3.8.0",
     ],
     entry_points={"console_scripts": ["agent=agent.main:app"]},
 )
@@ -18,7 +18,7 @@ def run_loop(
     iters: int = typer.Option(3, "--iters", help="Maximum number of iterations to run"),
 ):
     """Run the full route -> run -> eval -> patch loop for N iterations."""
-    if iters < 1 or iters > 10:
+    if not 1 <= iters <= 10:
         console.print("[red]Error:[/red] --iters must be between 1 and 10.")
         raise typer.Exit(1)
 
@@ -122,14 +122,15 @@ def mine_workflow(
         )
         raise typer.Exit(1)
 
-    trace_events = parse_trace_zip_actions(trace_path)
+    # The trace zip is read only when the recorder captured no user events.
+    trace_events = [] if interaction_events else parse_trace_zip_actions(trace_path)
     combined_events = interaction_events if interaction_events else trace_events
     trace_summary = build_trace_summary(interaction_events, trace_events)
 
-    EventLogger.console_log(
-        "Agent Miner",
-        f"Captured {len(interaction_events)} user events and {len(trace_events)} trace API events.",
-    )
+    captured = f"Captured {len(interaction_events)} user events"
+    if not interaction_events:
+        captured += f" and {len(trace_events)} trace API events"
+    EventLogger.console_log("Agent Miner", f"{captured}.")
     EventLogger.console_log(
         "Agent Miner", "Running multi-agent mining chain: mapper -> planner -> writer -> critic..."
     )
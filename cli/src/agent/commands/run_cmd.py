@@ -155,6 +155,8 @@ def run_skill(skill_id: str, input_file: Optional[Path] = None) -> str:
         content_type = "application/octet-stream"
         if file_name.endswith(".png"):
             content_type = "image/png"
+        elif file_name.endswith(".jpg"):
+            content_type = "image/jpeg"
         elif file_name.endswith(".json"):
             content_type = "application/json"
         elif file_name.endswith(".webm"):
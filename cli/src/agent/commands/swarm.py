@@ -4,12 +4,14 @@ import queue
 import re
 import shutil
 import subprocess
-import threading
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import typer
 from rich.console import Console
@@ -23,7 +25,11 @@ RUN_ID_RE = re.compile(
 )
 
 
-@dataclass
+# __slots__ via dataclass needs Python 3.10; 3.9 keeps the __dict__ layout.
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class SwarmTask:
     id: str
     prompt: Optional[str] = None
@@ -45,6 +51,25 @@ def _slug(value: str, limit: int = 32) -> str:
     return (s[:limit].strip("-") or "task")
 
 
+def _task_from_row(idx: int, raw: Dict[str, Any], default_prompt_task_type: str) -> SwarmTask:
+    get = raw.get
+    prompt = get("prompt")
+    # Tasks are frozen, so the default task type is settled before construction.
+    task_type = str(get("task_type") or "") or (
+        default_prompt_task_type if prompt else "run"
+    )
+    return SwarmTask(
+        id=str(get("id") or f"task_{idx}"),
+        prompt=prompt,
+        skill_id=get("skill_id"),
+        input_file=get("input_file"),
+        task_type=task_type,
+        platform_id=str(get("platform_id") or "envoice"),
+        auto_acquire=bool(get("auto_acquire", True)),
+        learn=bool(get("learn", True)),
+    )
+
+
 def _normalize_tasks(tasks_payload: Any, *, default_prompt_task_type: str) -> List[SwarmTask]:
     if isinstance(tasks_payload, dict):
         tasks_raw = tasks_payload.get("tasks", [])
@@ -53,30 +78,12 @@ def _normalize_tasks(tasks_payload: Any, *, default_prompt_task_type: str) -> Li
     else:
         tasks_raw = []
 
-    tasks: List[SwarmTask] = []
-    for idx, raw in enumerate(tasks_raw, start=1):
-        if not isinstance(raw, dict):
-            continue
-        task = SwarmTask(
-            id=str(raw.get("id") or f"task_{idx}"),
-            prompt=raw.get("prompt"),
-            skill_id=raw.get("skill_id"),
-            input_file=raw.get("input_file"),
-            task_type=str(raw.get("task_type") or ""),
-            platform_id=str(raw.get("platform_id") or "envoice"),
-            auto_acquire=bool(raw.get("auto_acquire", True)),
-            learn=bool(raw.get("learn", True)),
-        )
-        if not task.task_type:
-            if task.prompt:
-                task.task_type = default_prompt_task_type
-            elif task.skill_id:
-                task.task_type = "run"
-            else:
-                task.task_type = "ask"
-        if task.prompt or task.skill_id:
-            tasks.append(task)
-    return tasks
+    # Rows without a prompt or skill id are dropped before any task is built.
+    return [
+        _task_from_row(idx, raw, default_prompt_task_type)
+        for idx, raw in enumerate(tasks_raw, start=1)
+        if isinstance(raw, dict) and (raw.get("prompt") or raw.get("skill_id"))
+    ]
 
 
 def _load_tasks(
@@ -130,8 +137,53 @@ def _prepare_sandbox(
     return sandbox
 
 
+@lru_cache(maxsize=4096)
+def _cached_command(
+    prompt: Optional[str],
+    skill_id: Optional[str],
+    input_file: Optional[str],
+    task_type: str,
+    platform_id: str,
+    auto_acquire: bool,
+    learn: bool,
+) -> Optional[Tuple[str, ...]]:
+    """Command for a non-extrapolate task, or None if the task is unsupported."""
+    if prompt and task_type in {"ask", "execute"}:
+        return (
+            "agent",
+            "ask",
+            prompt,
+            "--yes",
+            "--platform-id",
+            platform_id,
+            "--auto-acquire" if auto_acquire else "--no-auto-acquire",
+            "--learn" if learn else "--no-learn",
+        )
+
+    if skill_id and task_type in {"run", "execute"}:
+        cmd: Tuple[str, ...] = ("agent", "run", skill_id)
+        if input_file:
+            cmd += (input_file,)
+        return cmd
+    if skill_id and task_type == "benchmark":
+        cmd = (
+            "agent",
+            "benchmark",
+            skill_id,
+            "--runs",
+            "1",
+            "--stop-on-failure",
+            "--headless",
+        )
+        if input_file:
+            cmd += ("--input-file", input_file)
+        return cmd
+    return None
+
+
 def _command_for_task(task: SwarmTask) -> List[str]:
     if task.prompt and task.task_type in {"extrapolate", "learn"}:
+        # Timestamped skill ids make these unique per call, so never cached.
         ts = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
         skill_id = f"{task.platform_id}.swarm.{_slug(task.id)}.{ts}"
         return [
@@ -144,52 +196,31 @@ def _command_for_task(task: SwarmTask) -> List[str]:
             skill_id,
         ]
 
-    if task.prompt and task.task_type in {"ask", "execute"}:
-        cmd = [
-            "agent",
-            "ask",
-            task.prompt,
-            "--yes",
-            "--platform-id",
-            task.platform_id,
-        ]
-        cmd.append("--auto-acquire" if task.auto_acquire else "--no-auto-acquire")
-        cmd.append("--learn" if task.learn else "--no-learn")
-        return cmd
-
-    if task.skill_id and task.task_type in {"run", "execute"}:
-        cmd = ["agent", "run", task.skill_id]
-        if task.input_file:
-            cmd.append(task.input_file)
-        return cmd
-    if task.skill_id and task.task_type == "benchmark":
-        cmd = [
-            "agent",
-            "benchmark",
-            task.skill_id,
-            "--runs",
-            "1",
-            "--stop-on-failure",
-            "--headless",
-        ]
-        if task.input_file:
-            cmd.extend(["--input-file", task.input_file])
-        return cmd
-    raise RuntimeError(
-        f"Task '{task.id}' has unsupported task_type='{task.task_type}' or missing fields."
+    cmd = _cached_command(
+        task.prompt,
+        task.skill_id,
+        task.input_file,
+        task.task_type,
+        task.platform_id,
+        task.auto_acquire,
+        task.learn,
     )
+    if cmd is None:
+        raise RuntimeError(
+            f"Task '{task.id}' has unsupported task_type='{task.task_type}' or missing fields."
+        )
+    # A fresh list, so callers never mutate the cached command.
+    return list(cmd)
 
 
 def _run_task_in_sandbox(
     task: SwarmTask,
     sandbox: Path,
     *,
-    headless: bool,
+    env: Dict[str, str],
     timeout_seconds: int,
 ) -> Dict[str, Any]:
     cmd = _command_for_task(task)
-    env = os.environ.copy()
-    env["HEADLESS"] = "1" if headless else "0"
     started = datetime.now(timezone.utc).isoformat()
     proc = subprocess.run(
         cmd,
@@ -314,46 +345,39 @@ def run_swarm(
         "bold magenta",
     )
 
-    q: queue.Queue[SwarmTask] = queue.Queue()
-    for task in tasks:
-        q.put(task)
-
-    results: List[Dict[str, Any]] = []
-    results_lock = threading.Lock()
-
-    def _worker_loop(worker_idx: int) -> None:
-        sandbox = worker_sandboxes[worker_idx]
-        while True:
-            try:
-                task = q.get_nowait()
-            except queue.Empty:
-                return
-            try:
-                result = _run_task_in_sandbox(
-                    task,
-                    sandbox,
-                    headless=headless,
-                    timeout_seconds=timeout_seconds,
-                )
-            except Exception as exc:
-                result = {
-                    "task_id": task.id,
-                    "prompt": task.prompt,
-                    "skill_id": task.skill_id,
-                    "sandbox": str(sandbox),
-                    "exit_code": 1,
-                    "run_ids": [],
-                    "error": str(exc),
-                }
-            with results_lock:
-                results.append(result)
-            q.task_done()
-
-    threads = [threading.Thread(target=_worker_loop, args=(i,)) for i in range(workers)]
-    for t in threads:
-        t.start()
-    for t in threads:
-        t.join()
+    # One environment for every task launch; subprocess only reads it.
+    task_env = {**os.environ, "HEADLESS": "1" if headless else "0"}
+
+    # Each task leases a sandbox for its duration; with one pool thread per
+    # sandbox the lease never waits and no two tasks share a sandbox.
+    free_sandboxes: "queue.Queue[Path]" = queue.Queue()
+    for sandbox in worker_sandboxes:
+        free_sandboxes.put(sandbox)
+
+    def _run_one(task: SwarmTask) -> Dict[str, Any]:
+        sandbox = free_sandboxes.get()
+        try:
+            return _run_task_in_sandbox(
+                task,
+                sandbox,
+                env=task_env,
+                timeout_seconds=timeout_seconds,
+            )
+        except Exception as exc:
+            return {
+                "task_id": task.id,
+                "prompt": task.prompt,
+                "skill_id": task.skill_id,
+                "sandbox": str(sandbox),
+                "exit_code": 1,
+                "run_ids": [],
+                "error": str(exc),
+            }
+        finally:
+            free_sandboxes.put(sandbox)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="swarm") as pool:
+        results = list(pool.map(_run_one, tasks))
 
     results = sorted(results, key=lambda x: str(x.get("task_id")))
     success_count = sum(1 for r in results if bool(r.get("task_ok")))
@@ -2,6 +2,8 @@ from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from agent.logger import load_env_robust
+
 
 class EnvConfig(BaseSettings):
     model_config = SettingsConfigDict(
@@ -68,4 +70,6 @@ class EnvConfig(BaseSettings):
         )
 
 
+# The working directory's .env must be in os.environ before settings are read.
+load_env_robust()
 config = EnvConfig()
@@ -1,10 +1,11 @@
-import json
 import os
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
-from playwright.sync_api import sync_playwright, Page
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+import orjson
+from playwright.sync_api import sync_playwright, Locator, Page
 from rich.console import Console
 from agent.logger import EventLogger
 
@@ -54,12 +55,49 @@ SCAN_EXISTING_DRAFTS_JS = """
 }
 """
 
+COLLECT_MANDATORY_ERRORS_JS = """
+() => Array.from(
+    document.querySelectorAll('.popover-content, .help-block, .text-danger')
+)
+    .filter(el => el.textContent.includes('Mandatory'))
+    .slice(0, 5)
+    .map(el => el.textContent.trim())
+"""
+
+BLOCKING_MODAL_SELECTOR = "#companyAddModal.modal.in, #companyAddModal.modal.show"
+
+# Installed on every document so _dismiss_modals can skip its visibility probe
+# when no blocking modal has been shown since the previous check.
+WATCH_BLOCKING_MODAL_JS = """
+(() => {
+    window.__modalSeen = false;
+    const check = () => {
+        if (document.querySelector('%s')) window.__modalSeen = true;
+    };
+    new MutationObserver(check).observe(document, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        attributeFilter: ['class'],
+    });
+})();
+""" % BLOCKING_MODAL_SELECTOR
+
+CONSUME_MODAL_SEEN_JS = """
+() => {
+    const seen = window.__modalSeen !== false
+        || !!document.querySelector('%s');
+    window.__modalSeen = false;
+    return seen;
+}
+""" % BLOCKING_MODAL_SELECTOR
+
 JS_FUNCTIONS = {
     "extract_sales_table": EXTRACT_SALES_TABLE_JS,
     "scan_existing_drafts": SCAN_EXISTING_DRAFTS_JS,
 }
 
-COOKIE_SELECTORS = [
+COOKIE_SELECTORS: tuple[str, ...] = (
     "button:has-text('Accept All')",
     "button:has-text('Accept all')",
     "button:has-text('Accept')",
@@ -67,7 +105,82 @@ COOKIE_SELECTORS = [
     "button[id='cky-btn-accept']",
     "button:has-text('OK')",
     "button:has-text('Agree')",
-]
+)
+LOGIN_URL_TOKENS: tuple[str, ...] = ("/login", "/signin", "/sign-in", "/auth")
+LOGIN_IDENTITY_SELECTORS: tuple[str, ...] = (
+    "input[type='email']",
+    "input[name='email']",
+    "input[id='email']",
+    "input[name*='user']",
+    "input[id*='user']",
+)
+LOGIN_PASSWORD_SELECTORS: tuple[str, ...] = (
+    "input[type='password']",
+    "input[name='password']",
+    "input[id='password']",
+)
+LOGIN_SUBMIT_SELECTORS: tuple[str, ...] = (
+    "button[type='submit']",
+    "input[type='submit']",
+    "button:has-text('Sign in')",
+    "button:has-text('Log in')",
+    "button:has-text('Login')",
+)
+MODAL_CLOSE_SELECTORS: tuple[str, ...] = (
+    "#companyAddModal .close",
+    "#companyAddModal button:has-text('Close')",
+    "#companyAddModal button:has-text('Cancel')",
+    "#companyAddModal [data-dismiss='modal']",
+)
+
+# Joined once so each probe builds a single Locator and costs one round-trip.
+COOKIE_JOINED = ", ".join(COOKIE_SELECTORS)
+LOGIN_IDENTITY_JOINED = ", ".join(LOGIN_IDENTITY_SELECTORS)
+LOGIN_PASSWORD_JOINED = ", ".join(LOGIN_PASSWORD_SELECTORS)
+LOGIN_SUBMIT_JOINED = ", ".join(LOGIN_SUBMIT_SELECTORS)
+MODAL_CLOSE_JOINED = ", ".join(MODAL_CLOSE_SELECTORS)
+
+
+def _first_visible(page: Page, selector: str) -> Locator:
+    """Locator for the first visible element matching a (joined) selector."""
+    return page.locator(selector).locator("visible=true").first
+
+
+def _first_visible_by_priority(
+    page: Page, selectors: tuple[str, ...], joined: str
+) -> Optional[Locator]:
+    """First visible match, honouring the order of `selectors`.
+
+    A joined selector matches in DOM order, so it only answers "is any of them
+    visible?" in one round-trip; the winner is then resolved in priority order.
+    """
+    if not _first_visible(page, joined).is_visible():
+        return None
+    for selector in selectors:
+        locator = _first_visible(page, selector)
+        if locator.is_visible():
+            return locator
+    return None
+
+
+# Viewport-only JPEG is plenty for step thumbnails; error.png stays lossless.
+STEP_SCREENSHOT_OPTIONS = {"type": "jpeg", "quality": 70, "full_page": False}
+
+PLACEHOLDER_RE = re.compile(r"\{\{(.+?)\}\}")
+
+SELECT2_READY_SELECTOR = ".select2-results__option:not(.loading-results)"
+
+# Resource types that never influence selectors or form state; dropped when
+# BLOCK_RESOURCES=1. Stylesheets stay: visibility checks depend on them.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+BLOCKED_TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "hotjar.com",
+    "facebook.net",
+    "clarity.ms",
+)
 
 
 class SkillExecutor:
@@ -79,6 +192,8 @@ class SkillExecutor:
         self.step_data: Dict[str, Any] = {}
         self._reauth_attempts = 0
         self._max_reauth_attempts = 1
+        self._cached_state: Optional[Dict[str, Any]] = None
+        self._cached_state_dirty = False
         self.report = {
             "run_id": run_id,
             "status": "running",
@@ -94,25 +209,45 @@ class SkillExecutor:
 
     def _persist_report(self) -> Dict[str, Any]:
         report_path = self.artifacts_dir / "run_report.json"
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(self.report, f, indent=2)
+        tmp_path = report_path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(self.report, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, report_path)
         self.report["artifacts"]["run_report_json"] = str(report_path)
         return self.report
 
+    def _block_resources(self, route):
+        request = route.request
+        url = request.url
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+            host in url for host in BLOCKED_TRACKER_HOSTS
+        ):
+            route.abort()
+        else:
+            route.continue_()
+
     def _resolve_value(self, value: Optional[str], slots: Dict[str, Any]) -> str:
         if not value or not isinstance(value, str):
             return value or ""
-        for k, v in slots.items():
-            value = value.replace(f"{{{{{k}}}}}", str(v))
+        unresolved = False
+
+        def substitute(match: re.Match) -> str:
+            nonlocal unresolved
+            name = match.group(1)
+            if name in slots:
+                return str(slots[name])
+            unresolved = True
+            return match.group(0)
+
+        value = PLACEHOLDER_RE.sub(substitute, value)
         # If any {{placeholder}} remains unresolved, return empty string
-        if re.search(r"\{\{.+?\}\}", value):
+        if unresolved:
             self.log_action("skip", f"unresolved placeholder in '{value}'")
             return ""
         return value
 
     def _is_login_page(self, page: Page) -> bool:
         url = (page.url or "").lower()
-        if any(token in url for token in ["/login", "/signin", "/sign-in", "/auth"]):
+        if any(token in url for token in LOGIN_URL_TOKENS):
             return True
 
         try:
@@ -127,15 +262,16 @@ class SkillExecutor:
         except Exception:
             return False
 
-    def _fill_first_visible(self, page: Page, selectors: list[str], value: str) -> bool:
-        for selector in selectors:
-            try:
-                field = page.locator(selector).first
-                if field.is_visible(timeout=500):
-                    field.fill(value)
-                    return True
-            except Exception:
-                continue
+    def _fill_first_visible(
+        self, page: Page, selectors: tuple[str, ...], joined: str, value: str
+    ) -> bool:
+        try:
+            field = _first_visible_by_priority(page, selectors, joined)
+            if field is not None:
+                field.fill(value)
+                return True
+        except Exception:
+            pass
         return False
 
     def _auto_relogin_if_needed(
@@ -165,24 +301,10 @@ class SkillExecutor:
         self.log_action("auth", "session expired, attempting automatic login")
 
         email_ok = self._fill_first_visible(
-            page,
-            [
-                "input[type='email']",
-                "input[name='email']",
-                "input[id='email']",
-                "input[name*='user']",
-                "input[id*='user']",
-            ],
-            username,
+            page, LOGIN_IDENTITY_SELECTORS, LOGIN_IDENTITY_JOINED, username
         )
         password_ok = self._fill_first_visible(
-            page,
-            [
-                "input[type='password']",
-                "input[name='password']",
-                "input[id='password']",
-            ],
-            password,
+            page, LOGIN_PASSWORD_SELECTORS, LOGIN_PASSWORD_JOINED, password
         )
 
         if not (email_ok and password_ok):
@@ -190,21 +312,15 @@ class SkillExecutor:
             return False
 
         clicked = False
-        for selector in [
-            "button[type='submit']",
-            "input[type='submit']",
-            "button:has-text('Sign in')",
-            "button:has-text('Log in')",
-            "button:has-text('Login')",
-        ]:
-            try:
-                btn = page.locator(selector).first
-                if btn.is_visible(timeout=500):
-                    btn.click()
-                    clicked = True
-                    break
-            except Exception:
-                continue
+        try:
+            btn = _first_visible_by_priority(
+                page, LOGIN_SUBMIT_SELECTORS, LOGIN_SUBMIT_JOINED
+            )
+            if btn is not None:
+                btn.click()
+                clicked = True
+        except Exception:
+            pass
 
         if not clicked:
             try:
@@ -218,13 +334,9 @@ class SkillExecutor:
             return False
 
         try:
-            page.wait_for_timeout(2000)
             page.wait_for_url(
                 lambda url: (
-                    not any(
-                        token in (url or "").lower()
-                        for token in ["/login", "/signin", "/sign-in", "/auth"]
-                    )
+                    not any(token in (url or "").lower() for token in LOGIN_URL_TOKENS)
                 ),
                 timeout=30000,
             )
@@ -235,44 +347,58 @@ class SkillExecutor:
 
         if resume_url:
             try:
-                page.goto(resume_url, wait_until="networkidle", timeout=30000)
+                page.goto(resume_url, wait_until="domcontentloaded", timeout=30000)
             except Exception:
                 pass
 
         try:
-            auth_path.parent.mkdir(parents=True, exist_ok=True)
-            context.storage_state(path=str(auth_path))
-            self.log_action("auth", f"auth state refreshed at {auth_path}")
+            self._cached_state = context.storage_state()
+            self._cached_state_dirty = True
+            self.log_action("auth", "auth state refreshed in memory")
         except Exception as e:
             self.log_action("warning", f"failed to refresh auth state: {e}")
 
         return True
 
+    def _flush_auth_state(self, auth_path: Path):
+        """Write a refreshed storage state to disk once, at run teardown."""
+        if not self._cached_state_dirty or self._cached_state is None:
+            return
+        try:
+            auth_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = auth_path.with_suffix(".tmp")
+            tmp_path.write_bytes(orjson.dumps(self._cached_state))
+            os.replace(tmp_path, auth_path)
+            self._cached_state_dirty = False
+            self.log_action("auth", f"auth state saved at {auth_path}")
+        except Exception as e:
+            self.log_action("warning", f"failed to save auth state: {e}")
+
     def _dismiss_modals(self, page: Page):
         """Dismiss any blocking modals (e.g. companyAddModal) before proceeding."""
         try:
-            modal = page.locator(
-                "#companyAddModal.modal.in, #companyAddModal.modal.show"
-            ).first
+            if not page.evaluate(CONSUME_MODAL_SEEN_JS):
+                return
+        except Exception:
+            pass
+        try:
+            modal = page.locator(BLOCKING_MODAL_SELECTOR).first
             if modal.is_visible(timeout=500):
                 # Try closing via the X button or Cancel
-                for close_sel in [
-                    "#companyAddModal .close",
-                    "#companyAddModal button:has-text('Close')",
-                    "#companyAddModal button:has-text('Cancel')",
-                    "#companyAddModal [data-dismiss='modal']",
-                ]:
-                    try:
-                        btn = page.locator(close_sel).first
-                        if btn.is_visible(timeout=500):
-                            btn.click(force=True)
-                            page.wait_for_timeout(1000)
-                            self.log_action(
-                                "dismissed", "blocking modal via close button"
-                            )
-                            return
-                    except Exception:
-                        continue
+                try:
+                    btn = _first_visible_by_priority(
+                        page, MODAL_CLOSE_SELECTORS, MODAL_CLOSE_JOINED
+                    )
+                    if btn is not None:
+                        btn.click(force=True)
+                        try:
+                            modal.wait_for(state="hidden", timeout=3000)
+                        except Exception:
+                            pass
+                        self.log_action("dismissed", "blocking modal via close button")
+                        return
+                except Exception:
+                    pass
                 # Fallback: hide via JS
                 page.evaluate("""
                     document.querySelector('#companyAddModal')?.classList.remove('in','show');
@@ -281,7 +407,6 @@ class SkillExecutor:
                     document.body.classList.remove('modal-open');
                     document.body.style.removeProperty('padding-right');
                 """)
-                page.wait_for_timeout(500)
                 self.log_action("dismissed", "blocking modal via JS fallback")
         except Exception:
             pass
@@ -289,16 +414,21 @@ class SkillExecutor:
     def _handle_cookies(self, page: Page):
         """Dismiss cookie consent banners using production-tested selectors."""
         self.log_action("handling", "cookie consent banner")
-        for selector in COOKIE_SELECTORS:
-            try:
-                el = page.locator(selector).first
-                if el.is_visible(timeout=2000):
-                    el.click()
-                    page.wait_for_timeout(1500)
-                    self.log_action("dismissed", "cookie banner")
-                    return
-            except Exception:
-                continue
+        try:
+            el = _first_visible_by_priority(page, COOKIE_SELECTORS, COOKIE_JOINED)
+            if el is not None:
+                # Wait on the clicked element itself: the visible=true locator
+                # would re-resolve to the next visible match after the click.
+                handle = el.element_handle()
+                handle.click()
+                try:
+                    handle.wait_for_element_state("hidden", timeout=3000)
+                except Exception:
+                    pass
+                self.log_action("dismissed", "cookie banner")
+                return
+        except Exception:
+            pass
         # Try hiding overlay directly
         try:
             page.evaluate("document.querySelector('.cky-overlay')?.remove()")
@@ -306,6 +436,13 @@ class SkillExecutor:
             pass
         self.log_action("skipped", "no cookie banner found")
 
+    def _wait_for_select2_results(self, page: Page):
+        """Wait until Select2 has rendered results for the current search."""
+        try:
+            page.wait_for_selector(SELECT2_READY_SELECTOR, timeout=3000)
+        except Exception:
+            pass
+
     def _select2(self, page: Page, step: Dict[str, Any], value: str):
         """Handle Select2 dropdown: click container, type search, pick result."""
         if not value:
@@ -323,17 +460,13 @@ class SkillExecutor:
         try:
             page.click(selector, timeout=8000)
         except Exception:
-            # JS click fallback
+            # Synthetic click fallback
             try:
-                el = page.query_selector(selector)
-                if el:
-                    page.evaluate("el => el.click()", el)
+                page.dispatch_event(selector, "click", timeout=2000)
             except Exception as e:
                 self.log_action("warning", f"select2 container click failed: {e}")
                 return
 
-        page.wait_for_timeout(500)
-
         try:
             search_field = page.locator(search_sel).last
             search_field.wait_for(state="visible", timeout=5000)
@@ -342,7 +475,7 @@ class SkillExecutor:
             self.log_action("warning", f"select2 search field not found: {e}")
             return
 
-        page.wait_for_timeout(2000)
+        self._wait_for_select2_results(page)
 
         try:
             # Try clicking highlighted first, then first visible result
@@ -387,10 +520,10 @@ class SkillExecutor:
             ).first
             if container.is_visible(timeout=5000):
                 container.click()
-                page.wait_for_timeout(500)
                 search = page.locator("input.select2-search__field").last
+                search.wait_for(state="visible", timeout=5000)
                 search.fill(value)
-                page.wait_for_timeout(1500)
+                self._wait_for_select2_results(page)
                 page.locator(".select2-results__option--highlighted").first.click()
                 self.log_action("selected", f"tax rule '{value}' via Select2")
                 return
@@ -433,37 +566,44 @@ class SkillExecutor:
     def _check_validation(self, page: Page):
         """Check for Envoice validation errors and log them."""
         try:
-            errors = page.locator(
-                ".popover-content:has-text('Mandatory'), "
-                ".help-block:has-text('Mandatory'), "
-                ".text-danger:has-text('Mandatory')"
-            )
-            count = errors.count()
-            if count > 0:
-                texts = [errors.nth(i).text_content() for i in range(min(count, 5))]
-                self.log_action("validation_error", f"{count} errors: {texts}")
+            texts = page.evaluate(COLLECT_MANDATORY_ERRORS_JS)
+            if texts:
+                self.log_action("validation_error", f"{len(texts)} errors: {texts}")
                 self.report["validation_errors"] = texts
             else:
                 self.log_action("validation", "no errors detected")
         except Exception:
             pass
 
+    _DEFAULTS_CACHE: Dict[date, Mapping[str, str]] = {}
+
+    @classmethod
+    def _today_defaults(cls) -> Mapping[str, str]:
+        today = datetime.now()
+        defaults = cls._DEFAULTS_CACHE.get(today.date())
+        if defaults is None:
+            today_str = f"{today:%d.%m.%Y}"
+            in_two_weeks = f"{today + timedelta(days=14):%d.%m.%Y}"
+            defaults = MappingProxyType(
+                {
+                    "invoice_date": today_str,
+                    "payment_deadline": in_two_weeks,
+                    "due_date": in_two_weeks,
+                    "delivery_date": today_str,
+                    "currency": "EUR",
+                    "quantity": "1",
+                    "unit": "month",
+                    "description": "General Service",
+                    "tax_rule": "Service export",
+                }
+            )
+            cls._DEFAULTS_CACHE.clear()
+            cls._DEFAULTS_CACHE[today.date()] = defaults
+        return defaults
+
     def _apply_slot_defaults(self, slots: Dict[str, Any]) -> Dict[str, Any]:
         """Fill missing slots with sensible defaults so placeholders don't leak."""
-        today = datetime.now()
-        defaults = {
-            "invoice_date": today.strftime("%d.%m.%Y"),
-            "payment_deadline": (today + timedelta(days=14)).strftime("%d.%m.%Y"),
-            "due_date": (today + timedelta(days=14)).strftime("%d.%m.%Y"),
-            "delivery_date": today.strftime("%d.%m.%Y"),
-            "currency": "EUR",
-            "quantity": "1",
-            "unit": "month",
-            "description": "General Service",
-            "tax_rule": "Service export",
-        }
-        merged = {**defaults, **{k: v for k, v in slots.items() if v}}
-        return merged
+        return {**self._today_defaults(), **{k: v for k, v in slots.items() if v}}
 
     def execute(
         self, skill_spec: Dict[str, Any], slots: Dict[str, Any]
@@ -479,13 +619,15 @@ class SkillExecutor:
         context = None
         page = None
         trace_started = False
+        record_trace = os.getenv("TRACE") == "1"
+        trace_on_failure = os.getenv("TRACE_ON_FAILURE") == "1"
+        record_video = os.getenv("VIDEO") == "1"
 
         try:
             with sync_playwright() as p:
                 browser = p.chromium.launch(headless=os.getenv("HEADLESS", "1") == "1")
 
                 context_kwargs = {
-                    "record_video_dir": str(self.artifacts_dir),
                     "viewport": {"width": 1920, "height": 1080},
                     "user_agent": (
                         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -493,7 +635,12 @@ class SkillExecutor:
                         "Chrome/122.0.0.0 Safari/537.36"
                     ),
                 }
-                if auth_path.exists():
+                if record_video:
+                    context_kwargs["record_video_dir"] = str(self.artifacts_dir)
+                if self._cached_state is not None:
+                    context_kwargs["storage_state"] = self._cached_state
+                    self.log_action("loading", "auth session from memory")
+                elif auth_path.exists():
                     context_kwargs["storage_state"] = str(auth_path)
                     self.log_action("loading", f"auth session from {auth_path}")
                 else:
@@ -502,8 +649,15 @@ class SkillExecutor:
                     )
 
                 context = browser.new_context(**context_kwargs)
-                context.tracing.start(screenshots=True, snapshots=True, sources=True)
-                trace_started = True
+                if os.getenv("BLOCK_RESOURCES") == "1":
+                    context.route("**/*", self._block_resources)
+                    self.log_action("blocking", "images, fonts, media and trackers")
+                context.add_init_script(WATCH_BLOCKING_MODAL_JS)
+                if record_trace or trace_on_failure:
+                    context.tracing.start(
+                        screenshots=True, snapshots=True, sources=True
+                    )
+                    trace_started = True
 
                 page = context.new_page()
                 step_index = 0
@@ -521,7 +675,7 @@ class SkillExecutor:
 
                     elif action == "goto":
                         self.log_action("navigating", f"to {value}")
-                        page.goto(value, wait_until="networkidle", timeout=30000)
+                        page.goto(value, wait_until="domcontentloaded", timeout=30000)
                         self._auto_relogin_if_needed(
                             page, context, auth_path, resume_url=value
                         )
@@ -531,12 +685,11 @@ class SkillExecutor:
                         self.log_action("clicking", f"'{selector}'")
                         try:
                             page.click(selector, timeout=8000)
-                        except Exception:
-                            el = page.query_selector(selector)
-                            if el:
-                                page.evaluate("el => el.click()", el)
-                            else:
-                                raise
+                        except Exception as click_error:
+                            try:
+                                page.dispatch_event(selector, "click", timeout=2000)
+                            except Exception:
+                                raise click_error
 
                     elif action == "fill":
                         resolved_val = self._resolve_value(value, slots)
@@ -606,14 +759,12 @@ class SkillExecutor:
                         timeout = int(step.get("timeout", 15000))
                         patterns = [p.strip() for p in value.split("|")]
                         self.log_action("waiting", f"for URL matching {patterns}")
+                        compiled = [
+                            re.compile(pat.replace("**", ".*").replace("*", "[^/]*"))
+                            for pat in patterns
+                        ]
                         page.wait_for_url(
-                            lambda url: any(
-                                re.search(
-                                    pat.replace("**", ".*").replace("*", "[^/]*"),
-                                    url,
-                                )
-                                for pat in patterns
-                            ),
+                            lambda url: any(c.search(url) for c in compiled),
                             timeout=timeout,
                         )
 
@@ -631,10 +782,12 @@ class SkillExecutor:
 
                     elif action == "screenshot":
                         step_index += 1
-                        path = self.artifacts_dir / f"step_{step_index}.png"
-                        page.screenshot(path=str(path))
+                        path = self.artifacts_dir / f"step_{step_index}.jpg"
+                        page.screenshot(path=str(path), **STEP_SCREENSHOT_OPTIONS)
+                        # Key names are part of the RunReport contract; the
+                        # value may point at a .jpg.
                         self.report["artifacts"][f"step_{step_index}_png"] = str(path)
-                        self.log_action("screenshot", f"saved step_{step_index}.png")
+                        self.log_action("screenshot", f"saved step_{step_index}.jpg")
 
                     elif action == "foreach":
                         self.log_action(
@@ -649,9 +802,9 @@ class SkillExecutor:
                     self.report["steps_completed"] += 1
 
                 # Final screenshot
-                last_png = self.artifacts_dir / "last.png"
-                page.screenshot(path=str(last_png))
-                self.report["artifacts"]["last_png"] = str(last_png)
+                last_jpg = self.artifacts_dir / "last.jpg"
+                page.screenshot(path=str(last_jpg), **STEP_SCREENSHOT_OPTIONS)
+                self.report["artifacts"]["last_png"] = str(last_jpg)
 
                 # Capture final URL
                 self.report["final_url"] = page.url
@@ -713,16 +866,20 @@ class SkillExecutor:
                 except Exception:
                     pass
         finally:
-            self.log_action("saving", "trace and video artifacts")
             if trace_started and context is not None:
+                keep_trace = record_trace or self.report["status"] != "success"
                 try:
-                    trace_path = self.artifacts_dir / "trace.zip"
-                    context.tracing.stop(path=str(trace_path))
-                    self.report["artifacts"]["trace_zip"] = str(trace_path)
+                    if keep_trace:
+                        self.log_action("saving", "trace artifact")
+                        trace_path = self.artifacts_dir / "trace.zip"
+                        context.tracing.stop(path=str(trace_path))
+                        self.report["artifacts"]["trace_zip"] = str(trace_path)
+                    else:
+                        context.tracing.stop()
                 except Exception:
                     pass
 
-            if page is not None:
+            if record_video and page is not None:
                 try:
                     video = page.video
                     if video:
@@ -733,6 +890,8 @@ class SkillExecutor:
                 except Exception:
                     pass
 
+            self._flush_auth_state(auth_path)
+
             if context is not None:
                 try:
                     context.close()
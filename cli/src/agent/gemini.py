@@ -2,6 +2,8 @@ from typing import Optional, Tuple
 
 import httpx
 
+from agent.http_client import get_client
+
 GEMINI_MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
 
 
@@ -40,7 +42,7 @@ def check_gemini_connectivity(
 
     for url, headers in attempts:
         try:
-            resp = httpx.get(url, headers=headers, timeout=timeout)
+            resp = get_client().get(url, headers=headers, timeout=timeout)
         except Exception as exc:
             failures.append(str(exc))
             continue
@@ -0,0 +1,27 @@
+import atexit
+import threading
+from typing import Optional
+
+import httpx
+
+_CLIENT: Optional[httpx.Client] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                # HTTP/2 lets concurrent Supabase/Google calls share one
+                # connection; hosts without h2 fall back to HTTP/1.1.
+                _CLIENT = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=100, max_keepalive_connections=20
+                    ),
+                    timeout=15.0,
+                )
+                atexit.register(_CLIENT.close)
+    return _CLIENT
@@ -1,9 +1,9 @@
 import re
-from typing import Any, Dict, Optional
-
-import httpx
+import time
+from typing import Any, Dict, Tuple
 
 from agent.config import config
+from agent.http_client import get_client
 
 _CURRENCY_MAP = {
     "$": "USD",
@@ -11,111 +11,115 @@ _CURRENCY_MAP = {
     "£": "GBP",
 }
 
-_FREQUENCY_PATTERNS = {
-    "weekly": r"\b(weekly|every week)\b",
-    "monthly": r"\b(monthly|every month)\b",
-    "quarterly": r"\b(quarterly|every quarter)\b",
-    "annual": r"\b(annual|annually|yearly|every year)\b",
-}
-
-_TAX_RULE_PATTERNS = {
-    "reverse_charge": r"\b(reverse charge)\b",
-    "standard": r"\b(standard tax|standard vat|standard)\b",
-    "reduced": r"\b(reduced tax|reduced vat|reduced)\b",
-    "zero_rated": r"\b(zero[- ]rated|zero vat|vat exempt)\b",
-}
-
-_EU_VAT_PREFIXES = {
-    "AT",
-    "BE",
-    "BG",
-    "CY",
-    "CZ",
-    "DE",
-    "DK",
-    "EE",
-    "EL",
-    "ES",
-    "FI",
-    "FR",
-    "HR",
-    "HU",
-    "IE",
-    "IT",
-    "LT",
-    "LU",
-    "LV",
-    "MT",
-    "NL",
-    "PL",
-    "PT",
-    "RO",
-    "SE",
-    "SI",
-    "SK",
-}
-
-
-def _extract_amount_and_currency(prompt: str) -> Dict[str, Any]:
-    symbol_match = re.search(r"([$€£])\s*([0-9]+(?:[.,][0-9]{1,2})?)", prompt)
-    if symbol_match:
-        symbol = symbol_match.group(1)
-        amount = float(symbol_match.group(2).replace(",", "."))
-        return {"amount": amount, "currency": _CURRENCY_MAP.get(symbol, "EUR")}
-
-    code_match = re.search(
-        r"\b([0-9]+(?:[.,][0-9]{1,2})?)\s*(USD|EUR|GBP|CHF|SEK|NOK|DKK)\b",
-        prompt,
-        flags=re.IGNORECASE,
+# Every slot is read in one left-to-right pass over the prompt. Within the
+# frequency and tax-rule alternations the named groups are listed in priority
+# order; keywords precede the VAT alternative so words such as "quarterly" are
+# never taken for VAT candidates.
+_PROMPT_TOKEN_RE = re.compile(
+    r"(?P<symbol>[$€£])\s*(?P<symbol_amount>[0-9]+(?:[.,][0-9]{1,2})?)"
+    r"|\b(?P<code_amount>[0-9]+(?:[.,][0-9]{1,2})?)\s*"
+    r"(?P<code>(?i:USD|EUR|GBP|CHF|SEK|NOK|DKK))\b"
+    r"|(?i:\b(?:"
+    r"(?P<weekly>weekly|every week)"
+    r"|(?P<monthly>monthly|every month)"
+    r"|(?P<quarterly>quarterly|every quarter)"
+    r"|(?P<annual>annual|annually|yearly|every year)"
+    r")\b)"
+    r"|(?i:\b(?:"
+    r"(?P<reverse_charge>reverse charge)"
+    r"|(?P<standard>standard tax|standard vat|standard)"
+    r"|(?P<reduced>reduced tax|reduced vat|reduced)"
+    r"|(?P<zero_rated>zero[- ]rated|zero vat|vat exempt)"
+    r")\b)"
+    r"|\b(?P<vat_id>[A-Za-z]{2}[A-Za-z0-9]{6,14})\b"
+)
+_FREQUENCY_RANK = {"weekly": 0, "monthly": 1, "quarterly": 2, "annual": 3}
+_TAX_RULE_RANK = {"reverse_charge": 0, "standard": 1, "reduced": 2, "zero_rated": 3}
+
+_EU_VAT_PREFIXES = frozenset(
+    {
+        "AT",
+        "BE",
+        "BG",
+        "CY",
+        "CZ",
+        "DE",
+        "DK",
+        "EE",
+        "EL",
+        "ES",
+        "FI",
+        "FR",
+        "HR",
+        "HU",
+        "IE",
+        "IT",
+        "LT",
+        "LU",
+        "LV",
+        "MT",
+        "NL",
+        "PL",
+        "PT",
+        "RO",
+        "SE",
+        "SI",
+        "SK",
+    }
+)
+_DIGIT_RE = re.compile(r"\d")
+
+
+# vat_id -> (expires_at monotonic seconds, result); insertion-ordered for eviction.
+_VAT_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_VAT_CACHE_TTL_SECONDS = 24 * 60 * 60
+_VAT_CACHE_MAX_ENTRIES = 1024
+
+
+def _is_eu_vat_id(candidate: str) -> bool:
+    # Broad EU VAT ID format: country prefix + alnum payload with a digit.
+    return (
+        candidate[:2] in _EU_VAT_PREFIXES and _DIGIT_RE.search(candidate, 2) is not None
     )
-    if code_match:
-        amount = float(code_match.group(1).replace(",", "."))
-        return {"amount": amount, "currency": code_match.group(2).upper()}
-
-    return {}
-
-
-def _extract_frequency(prompt: str) -> Optional[str]:
-    text = prompt.lower()
-    for frequency, pattern in _FREQUENCY_PATTERNS.items():
-        if re.search(pattern, text):
-            return frequency
-    return None
-
-
-def _extract_tax_rule(prompt: str) -> Optional[str]:
-    text = prompt.lower()
-    for tax_rule, pattern in _TAX_RULE_PATTERNS.items():
-        if re.search(pattern, text):
-            return tax_rule
-    return None
-
-
-def _extract_vat_id(prompt: str) -> Optional[str]:
-    # Broad EU VAT ID format: country prefix + alnum payload.
-    match = re.search(r"\b([A-Z]{2}[A-Z0-9]{6,14})\b", prompt.upper())
-    if match:
-        candidate = match.group(1)
-        prefix = candidate[:2]
-        payload = candidate[2:]
-        if prefix in _EU_VAT_PREFIXES and any(ch.isdigit() for ch in payload):
-            return candidate
-    return None
 
 
 def parse_invoice_prompt(prompt: str) -> Dict[str, Any]:
+    symbol_amount = code_amount = None
+    frequency = tax_rule = vat_id = None
+    for match in _PROMPT_TOKEN_RE.finditer(prompt):
+        kind = match.lastgroup
+        if kind == "symbol_amount":
+            if symbol_amount is None:
+                symbol_amount = match
+        elif kind == "code":
+            if code_amount is None:
+                code_amount = match
+        elif kind == "vat_id":
+            if vat_id is None:
+                candidate = match.group("vat_id").upper()
+                if _is_eu_vat_id(candidate):
+                    vat_id = candidate
+        elif kind in _FREQUENCY_RANK:
+            if frequency is None or (
+                _FREQUENCY_RANK[kind] < _FREQUENCY_RANK[frequency]
+            ):
+                frequency = kind
+        elif tax_rule is None or _TAX_RULE_RANK[kind] < _TAX_RULE_RANK[tax_rule]:
+            tax_rule = kind
+
     slots: Dict[str, Any] = {}
-    slots.update(_extract_amount_and_currency(prompt))
+    if symbol_amount is not None:
+        amount = symbol_amount.group("symbol_amount")
+        slots["amount"] = float(amount.replace(",", "."))
+        slots["currency"] = _CURRENCY_MAP.get(symbol_amount.group("symbol"), "EUR")
+    elif code_amount is not None:
+        slots["amount"] = float(code_amount.group("code_amount").replace(",", "."))
+        slots["currency"] = code_amount.group("code").upper()
 
-    frequency = _extract_frequency(prompt)
     if frequency:
         slots["period"] = frequency
-
-    tax_rule = _extract_tax_rule(prompt)
     if tax_rule:
         slots["tax_rule"] = tax_rule
-
-    vat_id = _extract_vat_id(prompt)
     if vat_id:
         slots["vat_id"] = vat_id
 
@@ -123,14 +127,19 @@ def parse_invoice_prompt(prompt: str) -> Dict[str, Any]:
 
 
 def validate_vat_id(vat_id: str) -> Dict[str, Any]:
+    now = time.monotonic()
+    cached = _VAT_CACHE.get(vat_id)
+    if cached is not None and cached[0] > now:
+        return dict(cached[1])
+
     url = config.VAT_CHECK_API_URL
     params = {"vat_number": vat_id}
 
     try:
-        response = httpx.get(url, params=params, timeout=15.0)
+        response = get_client().get(url, params=params, timeout=15.0)
         response.raise_for_status()
         payload = response.json()
-        return {
+        result = {
             "checked": True,
             "provider": "vatcomply(vies)",
             "vat_id": vat_id,
@@ -147,3 +156,13 @@ def validate_vat_id(vat_id: str) -> Dict[str, Any]:
             "valid": None,
             "error": str(exc),
         }
+
+    # Only successful lookups are cached; failures are retried next time.
+    _VAT_CACHE.pop(vat_id, None)
+    if len(_VAT_CACHE) >= _VAT_CACHE_MAX_ENTRIES:
+        _VAT_CACHE.pop(next(iter(_VAT_CACHE)))
+    _VAT_CACHE[vat_id] = (now + _VAT_CACHE_TTL_SECONDS, dict(result))
+    return result
+
+
+validate_vat_id.cache_clear = _VAT_CACHE.clear
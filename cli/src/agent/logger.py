@@ -1,41 +1,115 @@
+import atexit
+import functools
 import os
-import httpx
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any
-from dotenv import load_dotenv
+from typing import Dict, Any, List, Optional
+from agent.http_client import get_client
 from agent.supabase_auth import get_supabase_key
 
 
 # Find .env in the workspace root
+@functools.lru_cache(maxsize=1)
 def load_env_robust():
     current = Path.cwd()
     for _ in range(5):
         env_path = current / ".env"
         if env_path.exists():
+            from dotenv import load_dotenv
+
             load_dotenv(dotenv_path=env_path)
             return env_path
         current = current.parent
     return None
 
 
-load_env_robust()
+_loaded = False
+
+
+def _ensure_env():
+    """Load .env on first use unless the parent process already exported it."""
+    global _loaded
+    if _loaded:
+        return
+    if not os.environ.get("SUPABASE_URL"):
+        load_env_robust()
+    _loaded = True
 
 
 class EventLogger:
+    # Events are fire-and-forget: log() enqueues, a daemon thread bulk-inserts.
+    _queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=1000)
+    _batch_size = 50
+    _flush_interval = 0.25
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
+    _console = None
+
     @staticmethod
-    def log(event_type: str, details: str, metadata: Dict[str, Any] = None):
-        """Log a system event to Supabase for QA and audit trail."""
-        sb_url = os.getenv("SUPABASE_URL")
-        sb_key = get_supabase_key()
+    def _post(records: List[Dict[str, Any]]):
+        try:
+            sb_url = os.getenv("SUPABASE_URL")
+            sb_key = get_supabase_key()
+
+            if not sb_url or not sb_key:
+                return
+
+            headers = {
+                "apikey": sb_key,
+                "Authorization": f"Bearer {sb_key}",
+                "Content-Type": "application/json",
+            }
+
+            # Check if events table exists, if not this will just fail silently
+            get_client().post(
+                f"{sb_url}/rest/v1/events", headers=headers, json=records, timeout=5.0
+            )
+        except Exception:
+            pass
 
-        if not sb_url or not sb_key:
+    @classmethod
+    def _ensure_worker(cls):
+        if cls._worker is not None:
             return
+        with cls._worker_lock:
+            if cls._worker is not None:
+                return
+            # Create the client first so its atexit close runs after our flush.
+            get_client()
+            atexit.register(cls.flush)
+            cls._worker = threading.Thread(
+                target=cls._drain_forever, name="event-logger", daemon=True
+            )
+            cls._worker.start()
 
-        headers = {
-            "apikey": sb_key,
-            "Authorization": f"Bearer {sb_key}",
-            "Content-Type": "application/json",
-        }
+    @classmethod
+    def _drain_forever(cls):
+        while True:
+            batch = [cls._queue.get()]
+            deadline = time.monotonic() + cls._flush_interval
+            while len(batch) < cls._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(cls._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                cls._post(batch)
+            finally:
+                # Always settle the batch so flush()'s join() cannot hang.
+                for _ in batch:
+                    cls._queue.task_done()
+
+    @classmethod
+    def log(cls, event_type: str, details: str, metadata: Dict[str, Any] = None):
+        """Log a system event to Supabase for QA and audit trail."""
+        _ensure_env()
+        if not os.getenv("SUPABASE_URL") or not get_supabase_key():
+            return
 
         payload = {
             "event_type": event_type,
@@ -43,18 +117,36 @@ class EventLogger:
             "metadata": metadata or {},
         }
 
+        cls._ensure_worker()
         try:
-            # Check if events table exists, if not this will just fail silently
-            httpx.post(
-                f"{sb_url}/rest/v1/events", headers=headers, json=payload, timeout=5.0
-            )
-        except Exception:
-            pass
+            cls._queue.put_nowait(payload)
+        except queue.Full:
+            # Audit events are never dropped: post synchronously under backpressure.
+            cls._post([payload])
 
-    @staticmethod
-    def console_log(agent_name: str, message: str, style: str = "bold cyan"):
+    @classmethod
+    def flush(cls):
+        """Send queued events now and wait for any in-flight batch."""
+        records: List[Dict[str, Any]] = []
+        while True:
+            try:
+                records.append(cls._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(records), cls._batch_size):
+            batch = records[start : start + cls._batch_size]
+            try:
+                cls._post(batch)
+            finally:
+                for _ in batch:
+                    cls._queue.task_done()
+        cls._queue.join()
+
+    @classmethod
+    def console_log(cls, agent_name: str, message: str, style: str = "bold cyan"):
         """Print a formatted log to the console."""
-        from rich.console import Console
+        if cls._console is None:
+            from rich.console import Console
 
-        console = Console()
-        console.print(f"[{style}]{agent_name}:[/{style}] {message}")
+            cls._console = Console()
+        cls._console.print(f"[{style}]{agent_name}:[/{style}] {message}")
@@ -1,33 +1,133 @@
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
 import typer
+from typer.core import TyperGroup
 from rich.console import Console
 from rich.panel import Panel
-from agent.commands import (
-    benchmark,
-    bootstrap,
-    smoke,
-    cloud,
-    auth,
-    run_cmd,
-    ask,
-    eval_cmd,
-    patch,
-    loop,
-    overview,
-    mine,
-    extrapolate,
-    swarm,
-    storage_check,
-    chat,
-)
+from agent.logger import load_env_robust
 
 console = Console()
 
+# Subcommand name -> ("module:function", short help). Help listings use the
+# static text; a module is imported only when its command is dispatched.
+COMMANDS = {
+    "bootstrap": (
+        "agent.commands.bootstrap:run",
+        "Validate environment and create necessary directories.",
+    ),
+    "smoke-local": (
+        "agent.commands.smoke:run_local",
+        "Run local smoke test (Playwright screenshot).",
+    ),
+    "run": (
+        "agent.commands.run_cmd:run_skill",
+        "Execute a skill using local Playwright and sync results to Supabase.",
+    ),
+    "benchmark": (
+        "agent.commands.benchmark:run_benchmark",
+        "Run repeated execution/evaluation cycles and score skill reliability.",
+    ),
+    "ask": (
+        "agent.commands.ask:ask",
+        "Ask the agent to perform a task using natural language.",
+    ),
+    "eval": (
+        "agent.commands.eval_cmd:evaluate_run",
+        "Evaluate a run using Dust.tt to identify failures and propose patches.",
+    ),
+    "patch": (
+        "agent.commands.patch:apply_patch",
+        "Apply a JSON patch from an evaluation to a skill and update Supabase.",
+    ),
+    "loop": (
+        "agent.commands.loop:run_loop",
+        "Run the full route -> run -> eval -> patch loop for N iterations.",
+    ),
+    "overview": (
+        "agent.commands.overview:show_overview",
+        "Show system readiness, recent runs, and recurring invoice schedules.",
+    ),
+    "mine": (
+        "agent.commands.mine:mine_workflow",
+        "Record a manual workflow and use Gemini/Dust.tt to mine a SkillSpec.",
+    ),
+    "extrapolate": (
+        "agent.commands.extrapolate:extrapolate",
+        "Generate a new skill from platform memory (with AI + deterministic fallback).",
+    ),
+    "swarm": (
+        "agent.commands.swarm:run_swarm",
+        "Run prompt/skill tasks across isolated worker sandboxes.",
+    ),
+    "storage-check": (
+        "agent.commands.storage_check:check_storage",
+        "Check Supabase Storage visibility for artifacts/auth/seeds and run folders.",
+    ),
+    "chat": (
+        "agent.commands.chat:start_chat",
+        "Interactive chat with the agent about skills, Envoice, and automation.",
+    ),
+}
+AUTH_COMMANDS = {
+    "save": (
+        "agent.commands.auth:save_auth",
+        "Launch headed browser to capture Envoice auth state and upload to Supabase.",
+    ),
+}
+CLOUD_COMMANDS = {
+    "smoke": (
+        "agent.commands.cloud:smoke_cloud",
+        "Run cloud smoke: dependency checks + Worker /smoke execution.",
+    ),
+}
+
+
+class LazyGroup(TyperGroup):
+    """Typer group that imports a subcommand's module only when it is dispatched."""
+
+    lazy_commands: Dict[str, Tuple[str, str]] = {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return [*self.lazy_commands, *super().list_commands(ctx)]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        entry = self.lazy_commands.get(cmd_name)
+        if entry is None:
+            return super().get_command(ctx, cmd_name)
+        # Help rendering only needs the name and short help.
+        return click.Command(cmd_name, help=entry[1])
+
+    def resolve_command(
+        self, ctx: click.Context, args: List[str]
+    ) -> Tuple[Optional[str], Optional[click.Command], List[str]]:
+        cmd_name, cmd, rest = super().resolve_command(ctx, args)
+        if cmd_name in self.lazy_commands:
+            cmd = self._load_command(cmd_name)
+        return cmd_name, cmd, rest
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        # Command modules read settings at import, so .env must be loaded first.
+        load_env_robust()
+        module_name, attr = self.lazy_commands[cmd_name][0].split(":")
+        func = getattr(importlib.import_module(module_name), attr)
+        single = typer.Typer(add_completion=False)
+        single.command(name=cmd_name)(func)
+        return typer.main.get_command(single)
+
+
+def _lazy_group(commands: Dict[str, Tuple[str, str]]) -> type:
+    return type("LazyGroup", (LazyGroup,), {"lazy_commands": commands})
+
+
 WELCOME_ART = "[bold cyan]envoice-agent[/bold cyan]  [dim]headless invoice automation + learning loop[/dim]"
 
 app = typer.Typer(
     name="agent",
     help="Envoice CLI Agent Trainer",
     no_args_is_help=True,
+    cls=_lazy_group(COMMANDS),
 )
 
 
@@ -54,30 +154,13 @@ def main(ctx: typer.Context):
         )
 
 
-app.command(name="bootstrap")(bootstrap.run)
-app.command(name="smoke-local")(smoke.run_local)
-app.command(name="run")(run_cmd.run_skill)
-app.command(name="benchmark")(benchmark.run_benchmark)
-app.command(name="ask")(ask.ask)
-app.command(name="eval")(eval_cmd.evaluate_run)
-app.command(name="patch")(patch.apply_patch)
-app.command(name="loop")(loop.run_loop)
-app.command(name="overview")(overview.show_overview)
-app.command(name="mine")(mine.mine_workflow)
-app.command(name="extrapolate")(extrapolate.extrapolate)
-app.command(name="swarm")(swarm.run_swarm)
-app.command(name="storage-check")(storage_check.check_storage)
-app.command(name="chat")(chat.start_chat)
-
 # Auth group
-auth_app = typer.Typer(help="Authentication management")
+auth_app = typer.Typer(help="Authentication management", cls=_lazy_group(AUTH_COMMANDS))
 app.add_typer(auth_app, name="auth")
-auth_app.command(name="save")(auth.save_auth)
 
 # Cloud group
-cloud_app = typer.Typer(help="Cloud operations")
+cloud_app = typer.Typer(help="Cloud operations", cls=_lazy_group(CLOUD_COMMANDS))
 app.add_typer(cloud_app, name="cloud")
-cloud_app.command(name="smoke")(cloud.smoke_cloud)
 
 if __name__ == "__main__":
     app()
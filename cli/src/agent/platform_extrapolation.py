@@ -1,4 +1,45 @@
-from typing import Any, Dict, List, Optional
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Needles are stored lowercase; candidates are lowered once per extrapolation.
+_CUSTOMER_SELECT2_NEEDLES = (
+    "select2-buyercompanyid-container",
+    "buyercompanyid",
+    "select2-companyid-container",
+)
+_INVOICE_DATE_NEEDLES = ("sales_invoice__invoice_date", "invoice_date")
+_TRANSACTION_DATE_NEEDLES = ("sales_invoice__transaction_date", "transaction_date")
+_DUE_DAYS_NEEDLES = ("sales_invoice__due_days", "due_days")
+_DESCRIPTION_NEEDLES = ("row[0][description]", "row_description", "description")
+_AMOUNT_NEEDLES = ("row[0][item_amount]", "row_item_amount", "item_amount", "amount")
+_QTY_NEEDLES = ("row[0][item_qty]", "item_qty", "quantity")
+_SAVE_BUTTON_NEEDLES = (
+    "save",
+    "btn-warning",
+    "btn-primary",
+    "submit",
+    "sales_invoice__save",
+)
+_SALES_PATH_NEEDLES = ("/desktop/sale/add", "/desktop/sale/new")
+_PURCHASE_PATH_NEEDLES = (
+    "/desktop/purchase/add",
+    "/desktop/purchase/new",
+    "/desktop/purchase",
+)
+
+
+class _Candidates(NamedTuple):
+    raw: List[str]
+    lowered: List[str]
+    joined: str  # lowered candidates separated by "\n"
+    starts: List[int]  # offset of each candidate inside `joined`
+
+
+def _lowered(values: List[str]) -> _Candidates:
+    lowered = [v.lower() for v in values]
+    starts = [0, *accumulate(len(low) + 1 for low in lowered)][:-1]
+    return _Candidates(values, lowered, "\n".join(lowered), starts)
 
 
 def _sorted_selectors(platform_map: Dict[str, Any]) -> List[str]:
@@ -8,31 +49,24 @@ def _sorted_selectors(platform_map: Dict[str, Any]) -> List[str]:
     return []
 
 
-def _pick_selector(selectors: List[str], needles: List[str]) -> Optional[str]:
-    lowered = [(s, s.lower()) for s in selectors]
+def _pick_selector(candidates: _Candidates, needles: Tuple[str, ...]) -> Optional[str]:
+    """First candidate containing the earliest needle that matches any candidate."""
+    # One C-level str.find per needle over all candidates; needles never contain
+    # "\n", so a hit cannot straddle two candidates.
     for needle in needles:
-        n = needle.lower()
-        for raw, low in lowered:
-            if n in low:
-                return raw
+        idx = candidates.joined.find(needle)
+        if idx >= 0:
+            return candidates.raw[bisect_right(candidates.starts, idx) - 1]
     return None
 
 
-def _candidate_add_path(prompt: str, paths: List[str]) -> str:
+def _candidate_add_path(prompt: str, candidates: _Candidates) -> str:
     p = prompt.lower()
-    sales_needles = ["/desktop/sale/add", "/desktop/sale/new"]
-    purchase_needles = [
-        "/desktop/purchase/add",
-        "/desktop/purchase/new",
-        "/desktop/purchase",
-    ]
-    target = purchase_needles if "purchase" in p else sales_needles
-    lowered = [(x, x.lower()) for x in paths]
-    for needle in target:
-        for raw, low in lowered:
-            if needle in low:
-                return raw
-    for raw, low in lowered:
+    target = _PURCHASE_PATH_NEEDLES if "purchase" in p else _SALES_PATH_NEEDLES
+    picked = _pick_selector(candidates, target)
+    if picked:
+        return picked
+    for raw, low in zip(candidates.raw, candidates.lowered):
         if "/desktop/" in low and ("add" in low or "new" in low) and "edit" not in low:
             return raw
     if "purchase" in p:
@@ -62,31 +96,59 @@ def _add_slot(
     return name
 
 
+_ROW_TOKEN = "sales_invoice__row[0]"
+# field -> (field token, default selector, append ":visible" to explicit picks)
+_CANON_TABLE: Dict[str, Tuple[str, str, bool]] = {
+    "description": (
+        "[description]",
+        "input[name='sales_invoice__row[0][description]']:visible",
+        True,
+    ),
+    "amount": (
+        "[item_amount]",
+        "input[name='sales_invoice__row[0][item_amount]']:visible",
+        True,
+    ),
+    "quantity": (
+        "[item_qty]",
+        "input[name='sales_invoice__row[0][item_qty]']:visible",
+        False,
+    ),
+}
+
+
 def _canonical_invoice_selector(field: str, picked: Optional[str]) -> Optional[str]:
-    p = (picked or "").lower()
-    if field == "description":
-        if not picked or ("sales_invoice__row[0]" in p and "[description]" not in p):
-            return "input[name='sales_invoice__row[0][description]']:visible"
-        if "[description]" in p and ":visible" not in p:
-            return f"{picked}:visible"
-        return picked
-    if field == "amount":
-        if not picked or ("sales_invoice__row[0]" in p and "[item_amount]" not in p):
-            return "input[name='sales_invoice__row[0][item_amount]']:visible"
-        if "[item_amount]" in p and ":visible" not in p:
-            return f"{picked}:visible"
-        return picked
-    if field == "quantity":
-        if not picked or ("sales_invoice__row[0]" in p and "[item_qty]" not in p):
-            return "input[name='sales_invoice__row[0][item_qty]']:visible"
-        return picked
-    if field == "due_days":
-        if picked and "#due_days" in p and "#sales_invoice__due_days" not in p:
-            return "input#sales_invoice__due_days"
+    entry = _CANON_TABLE.get(field)
+    if entry is None:
+        if field == "due_days" and picked:
+            p = picked.lower()
+            if "#due_days" in p and "#sales_invoice__due_days" not in p:
+                return "input#sales_invoice__due_days"
         return picked
+    field_token, default, add_visible = entry
+    if not picked:
+        return default
+    p = picked.lower()
+    if _ROW_TOKEN in p and field_token not in p:
+        return default
+    if add_visible and field_token in p and ":visible" not in p:
+        return f"{picked}:visible"
     return picked
 
 
+# Each field is picked and canonicalized in one pass over this table.
+_FIELD_NEEDLES: Dict[str, Tuple[str, ...]] = {
+    "customer": _CUSTOMER_SELECT2_NEEDLES,
+    "invoice_date": _INVOICE_DATE_NEEDLES,
+    "transaction_date": _TRANSACTION_DATE_NEEDLES,
+    "due_days": _DUE_DAYS_NEEDLES,
+    "description": _DESCRIPTION_NEEDLES,
+    "amount": _AMOUNT_NEEDLES,
+    "quantity": _QTY_NEEDLES,
+    "save": _SAVE_BUTTON_NEEDLES,
+}
+
+
 def extrapolate_skill_from_platform_map(
     *,
     prompt: str,
@@ -94,8 +156,8 @@ def extrapolate_skill_from_platform_map(
     skill_id: str,
     default_base_url: str,
 ) -> Dict[str, Any]:
-    selectors = _sorted_selectors(platform_map)
-    paths = list((platform_map.get("signals", {}).get("paths", {}) or {}).keys())
+    selectors = _lowered(_sorted_selectors(platform_map))
+    paths = _lowered(list((platform_map.get("signals", {}).get("paths", {}) or {})))
     base = _base_url(platform_map, default_base_url)
     add_path = _candidate_add_path(prompt, paths)
     target_url = add_path if add_path.startswith("http") else f"{base}{add_path}"
@@ -104,36 +166,18 @@ def extrapolate_skill_from_platform_map(
     slot_props: Dict[str, Any] = {}
     required: List[str] = []
 
-    customer_select2 = _pick_selector(
-        selectors,
-        [
-            "select2-buyercompanyid-container",
-            "buyercompanyid",
-            "select2-companyid-container",
-        ],
-    )
-    invoice_date = _pick_selector(selectors, ["sales_invoice__invoice_date", "invoice_date"])
-    transaction_date = _pick_selector(
-        selectors, ["sales_invoice__transaction_date", "transaction_date"]
-    )
-    due_days = _pick_selector(selectors, ["sales_invoice__due_days", "due_days"])
-    description = _pick_selector(
-        selectors, ["row[0][description]", "row_description", "description"]
-    )
-    amount = _pick_selector(
-        selectors,
-        ["row[0][item_amount]", "row_item_amount", "item_amount", "amount"],
-    )
-    qty = _pick_selector(selectors, ["row[0][item_qty]", "item_qty", "quantity"])
-    save_btn = _pick_selector(
-        selectors,
-        ["save", "btn-warning", "btn-primary", "submit", "sales_invoice__save"],
-    )
-
-    due_days = _canonical_invoice_selector("due_days", due_days)
-    description = _canonical_invoice_selector("description", description)
-    amount = _canonical_invoice_selector("amount", amount)
-    qty = _canonical_invoice_selector("quantity", qty)
+    picked = {
+        field: _canonical_invoice_selector(field, _pick_selector(selectors, needles))
+        for field, needles in _FIELD_NEEDLES.items()
+    }
+    customer_select2 = picked["customer"]
+    invoice_date = picked["invoice_date"]
+    transaction_date = picked["transaction_date"]
+    due_days = picked["due_days"]
+    description = picked["description"]
+    amount = picked["amount"]
+    qty = picked["quantity"]
+    save_btn = picked["save"]
 
     if customer_select2:
         slot = _add_slot(slot_props, required, "customer", "Customer name")
@@ -1,11 +1,24 @@
-import json
+import heapq
+import os
+import re
+import sys
 from collections import Counter
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 from urllib.parse import urlparse
 
+import orjson
+
 STATE_PLATFORM_DIR = Path(".state/platform_maps")
+_RECENT_EVENTS_CAP = 300
+_EVENT_FIELDS = ("type", "url", "selector", "text", "value", "ts")
+# URLs containing these need urlparse's full handling (path params, stripping).
+_URL_SLOW_CHARS = frozenset(";\t\r\n")
+# Runs of anything that is not a letter or digit collapse to one underscore.
+_SLUG_SEPARATOR_RE = re.compile(r"[\W_]+")
 
 
 def _utc_now_iso() -> str:
@@ -13,10 +26,7 @@ def _utc_now_iso() -> str:
 
 
 def _safe_slug(value: str) -> str:
-    slug = "".join(ch.lower() if ch.isalnum() else "_" for ch in value.strip())
-    while "__" in slug:
-        slug = slug.replace("__", "_")
-    return slug.strip("_") or "default"
+    return _SLUG_SEPARATOR_RE.sub("_", value.strip().lower()).strip("_") or "default"
 
 
 def _platform_map_path(platform_id: str) -> Path:
@@ -27,10 +37,11 @@ def _platform_map_path(platform_id: str) -> Path:
 def load_platform_map(platform_id: str) -> Dict[str, Any]:
     path = _platform_map_path(platform_id)
     if not path.exists():
+        now_iso = _utc_now_iso()
         return {
             "platform_id": platform_id,
-            "created_at": _utc_now_iso(),
-            "updated_at": _utc_now_iso(),
+            "created_at": now_iso,
+            "updated_at": now_iso,
             "base_urls": [],
             "signals": {"selectors": {}, "actions": {}, "paths": {}},
             "recent_events": [],
@@ -38,8 +49,7 @@ def load_platform_map(platform_id: str) -> Dict[str, Any]:
             "mimic_sessions": [],
         }
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = orjson.loads(path.read_bytes())
     data.setdefault("platform_id", platform_id)
     data.setdefault("base_urls", [])
     data.setdefault("signals", {"selectors": {}, "actions": {}, "paths": {}})
@@ -53,25 +63,56 @@ def save_platform_map(platform_id: str, platform_map: Dict[str, Any]) -> Path:
     path = _platform_map_path(platform_id)
     platform_map["platform_id"] = platform_id
     platform_map["updated_at"] = _utc_now_iso()
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(platform_map, f, indent=2)
+    # Per-process temp name: concurrent swarm workers saving the same platform
+    # must not write into (or rename away) each other's temp file.
+    tmp_path = path.with_suffix(f".json.{os.getpid()}.tmp")
+    tmp_path.write_bytes(orjson.dumps(platform_map, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, path)
     return path
 
 
-def _normalize_recent_events(events: Iterable[Dict[str, Any]], cap: int = 300) -> List[Dict[str, Any]]:
-    normalized: List[Dict[str, Any]] = []
-    for event in events:
-        normalized.append(
-            {
-                "type": event.get("type"),
-                "url": event.get("url"),
-                "selector": event.get("selector"),
-                "text": event.get("text"),
-                "value": event.get("value"),
-                "ts": event.get("ts"),
-            }
-        )
-    return normalized[-cap:]
+def _normalize_recent_events(
+    events: Iterable[Dict[str, Any]], cap: int = _RECENT_EVENTS_CAP
+) -> List[Dict[str, Any]]:
+    # Slice first so discarded events are never rebuilt; events that already
+    # have the stored shape are passed through as-is.
+    return [
+        event
+        if tuple(event) == _EVENT_FIELDS
+        else {field: event.get(field) for field in _EVENT_FIELDS}
+        for event in list(events)[-cap:]
+    ]
+
+
+@lru_cache(maxsize=4096)
+def _url_path_with_query(url: str) -> str:
+    """Interned "path?query" of `url`; memoized since recorded URLs repeat heavily."""
+    return sys.intern(_split_path_with_query(url))
+
+
+def _split_path_with_query(url: str) -> str:
+    """Return "path?query" for an absolute URL; the fragment is dropped."""
+    scheme_end = url.find("://")
+    simple = scheme_end > 0 and url[:scheme_end].isalnum()
+    if not simple or not _URL_SLOW_CHARS.isdisjoint(url):
+        parsed = urlparse(url)
+        path = parsed.path or "/"
+        return f"{path}?{parsed.query}" if parsed.query else path
+
+    rest = url[scheme_end + 3 :].partition("#")[0]
+    path_start = len(rest)
+    for delimiter in "/?":
+        pos = rest.find(delimiter)
+        if 0 <= pos < path_start:
+            path_start = pos
+    path, _, query = rest[path_start:].partition("?")
+    path = path or "/"
+    return f"{path}?{query}" if query else path
+
+
+def _top_counts(counts: Dict[str, int], limit: int) -> Dict[str, int]:
+    """Keep the `limit` highest counts, descending (ties keep insertion order)."""
+    return dict(heapq.nlargest(limit, counts.items(), key=itemgetter(1)))
 
 
 def merge_platform_signals(
@@ -81,48 +122,67 @@ def merge_platform_signals(
     skill_id: str,
     source: str,
 ) -> Dict[str, Any]:
+    now_iso = _utc_now_iso()
     signals = platform_map.setdefault(
         "signals", {"selectors": {}, "actions": {}, "paths": {}}
     )
-    selector_counter = Counter(signals.get("selectors", {}))
-    action_counter = Counter(signals.get("actions", {}))
-    path_counter = Counter(signals.get("paths", {}))
+    selector_counts = signals.setdefault("selectors", {})
+    action_counts = signals.setdefault("actions", {})
+    path_counts = signals.setdefault("paths", {})
 
     if base_url and base_url not in platform_map.get("base_urls", []):
         platform_map.setdefault("base_urls", []).append(base_url)
 
-    for event in interaction_events:
-        event_type = str(event.get("type") or "").strip()
-        selector = str(event.get("selector") or "").strip()
-        url = str(event.get("url") or "").strip()
-
-        if event_type:
-            action_counter[event_type] += 1
-        if selector:
-            selector_counter[selector] += 1
-        if url:
-            parsed = urlparse(url)
-            path = parsed.path or "/"
-            if parsed.query:
-                path = f"{path}?{parsed.query}"
-            path_counter[path] += 1
-
-    signals["selectors"] = dict(selector_counter.most_common(200))
-    signals["actions"] = dict(action_counter.most_common(100))
-    signals["paths"] = dict(path_counter.most_common(200))
+    # Counter.update tallies into the stored dicts in place, counting in C.
+    Counter.update(
+        action_counts,
+        filter(
+            None,
+            (str(event.get("type") or "").strip() for event in interaction_events),
+        ),
+    )
+    # Selectors and paths repeat across events; interned keys share one string
+    # object per value, so repeat lookups compare by identity. Paths come back
+    # interned from _url_path_with_query.
+    Counter.update(
+        selector_counts,
+        map(
+            sys.intern,
+            filter(
+                None,
+                (str(event.get("selector") or "").strip() for event in interaction_events),
+            ),
+        ),
+    )
+    Counter.update(
+        path_counts,
+        (
+            _url_path_with_query(url)
+            for url in (str(event.get("url") or "").strip() for event in interaction_events)
+            if url
+        ),
+    )
+
+    signals["selectors"] = _top_counts(selector_counts, 200)
+    signals["actions"] = _top_counts(action_counts, 100)
+    signals["paths"] = _top_counts(path_counts, 200)
 
     existing_skill_ids = {str(item.get("id")) for item in platform_map.get("skills", [])}
     if skill_id and skill_id not in existing_skill_ids:
         platform_map.setdefault("skills", []).append(
-            {"id": skill_id, "source": source, "captured_at": _utc_now_iso()}
+            {"id": skill_id, "source": source, "captured_at": now_iso}
         )
 
+    # Only the tail of the old history that survives the cap is copied.
+    keep = _RECENT_EVENTS_CAP - len(interaction_events)
+    previous = platform_map.get("recent_events") or []
+    carried = list(previous[-keep:]) if keep > 0 else []
     platform_map["recent_events"] = _normalize_recent_events(
-        list(platform_map.get("recent_events", [])) + interaction_events
+        carried + interaction_events, _RECENT_EVENTS_CAP
     )
     platform_map.setdefault("mimic_sessions", []).append(
         {
-            "captured_at": _utc_now_iso(),
+            "captured_at": now_iso,
             "event_count": len(interaction_events),
             "skill_id": skill_id,
             "source": source,
@@ -134,9 +194,9 @@ def merge_platform_signals(
 
 def platform_map_digest(platform_map: Dict[str, Any], top_n: int = 30) -> Dict[str, Any]:
     signals = platform_map.get("signals", {})
-    selectors = dict(list((signals.get("selectors") or {}).items())[:top_n])
-    actions = dict(list((signals.get("actions") or {}).items())[:top_n])
-    paths = dict(list((signals.get("paths") or {}).items())[:top_n])
+    selectors = _top_counts(signals.get("selectors") or {}, top_n)
+    actions = _top_counts(signals.get("actions") or {}, top_n)
+    paths = _top_counts(signals.get("paths") or {}, top_n)
 
     return {
         "platform_id": platform_map.get("platform_id"),
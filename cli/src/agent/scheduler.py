@@ -1,8 +1,29 @@
-import json
+import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, Optional
 
+import orjson
+
+_CRON = MappingProxyType(
+    {
+        "weekly": "0 9 * * 1",
+        "monthly": "0 9 1 * *",
+        "quarterly": "0 9 1 */3 *",
+        "annual": "0 9 1 1 *",
+    }
+)
+# Monthly invoices should also prime adjacent cadences for learning/orchestration.
+_FANOUT = MappingProxyType(
+    {
+        "weekly": ("weekly",),
+        "monthly": ("weekly", "monthly", "quarterly", "annual"),
+        "quarterly": ("quarterly",),
+        "annual": ("annual",),
+    }
+)
+
 
 def _add_months(dt: datetime, months: int) -> datetime:
     month = dt.month - 1 + months
@@ -28,25 +49,11 @@ def compute_next_run(frequency: str, now: Optional[datetime] = None) -> datetime
 
 
 def cron_for_frequency(frequency: str) -> Optional[str]:
-    if frequency == "weekly":
-        return "0 9 * * 1"
-    if frequency == "monthly":
-        return "0 9 1 * *"
-    if frequency == "quarterly":
-        return "0 9 1 */3 *"
-    if frequency == "annual":
-        return "0 9 1 1 *"
-    return None
+    return _CRON.get(frequency)
 
 
 def frequencies_for_period(period: str) -> list[str]:
-    normalized = (period or "").strip().lower()
-    if normalized == "monthly":
-        # Monthly invoices should also prime adjacent cadences for learning/orchestration.
-        return ["weekly", "monthly", "quarterly", "annual"]
-    if normalized in {"weekly", "quarterly", "annual"}:
-        return [normalized]
-    return []
+    return list(_FANOUT.get((period or "").strip().lower(), ()))
 
 
 def save_recurring_job(
@@ -55,7 +62,8 @@ def save_recurring_job(
     slots: Dict[str, Any],
     frequency: str,
 ) -> Path:
-    next_run = compute_next_run(frequency)
+    now = datetime.now(timezone.utc)
+    next_run = compute_next_run(frequency, now)
     cron = cron_for_frequency(frequency)
 
     job = {
@@ -65,15 +73,16 @@ def save_recurring_job(
         "slots": slots,
         "next_run_at": next_run.isoformat(),
         "cron_utc": cron,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": now.isoformat(),
     }
 
     jobs_dir = Path(".state/runs/schedules")
     jobs_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    timestamp = now.strftime("%Y%m%dT%H%M%S%fZ")
     filename = f"{timestamp}_{skill_id.replace('.', '_')}_{frequency.lower()}.json"
     path = jobs_dir / filename
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(job, f, indent=2)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_bytes(orjson.dumps(job, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, path)
     return path
@@ -1,16 +1,21 @@
 import os
-import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
-import httpx
+import orjson
 
+from agent.http_client import get_client
 from agent.supabase_auth import get_supabase_key
 
 
+_SEEDS_PREFIX = "artifacts/seeds"
+_SLASH_TABLE = str.maketrans({"/": "__"})
+
+
+@lru_cache(maxsize=1024)
 def _seed_storage_path(skill_id: str) -> str:
-    safe_id = skill_id.strip().replace("/", "__")
-    return f"artifacts/seeds/{safe_id}.json"
+    return f"{_SEEDS_PREFIX}/{skill_id.strip().translate(_SLASH_TABLE)}.json"
 
 
 def _upsert_skill_row(
@@ -18,11 +23,8 @@ def _upsert_skill_row(
     sb_key: str,
     *,
     skill_id: str,
-    seed_path: Path,
+    spec: Dict[str, Any],
 ) -> None:
-    with open(seed_path, "r", encoding="utf-8") as f:
-        spec = json.load(f)
-
     sid = str(spec.get("id") or skill_id)
     version = int(spec.get("version") or 1)
     payload = {"id": sid, "version": version, "spec": spec}
@@ -32,7 +34,9 @@ def _upsert_skill_row(
         "Content-Type": "application/json",
         "Prefer": "resolution=merge-duplicates,return=minimal",
     }
-    resp = httpx.post(f"{sb_url}/rest/v1/skills", headers=headers, json=payload, timeout=20.0)
+    resp = get_client().post(
+        f"{sb_url}/rest/v1/skills", headers=headers, json=payload, timeout=20.0
+    )
     resp.raise_for_status()
 
 
@@ -46,7 +50,9 @@ def sync_seed_to_supabase(
     sb_key = get_supabase_key()
     if not sb_url or not sb_key:
         return None
-    if not seed_path.exists():
+    try:
+        body = seed_path.read_bytes()
+    except FileNotFoundError:
         return None
 
     storage_path = _seed_storage_path(skill_id)
@@ -58,10 +64,8 @@ def sync_seed_to_supabase(
         "x-upsert": "true",
         "x-seed-source": source,
     }
-    with open(seed_path, "rb") as f:
-        body = f.read()
-
-    resp = httpx.post(upload_url, headers=headers, content=body, timeout=20.0)
+    resp = get_client().post(upload_url, headers=headers, content=body, timeout=20.0)
     resp.raise_for_status()
-    _upsert_skill_row(sb_url, sb_key, skill_id=skill_id, seed_path=seed_path)
+    # The uploaded bytes are decoded once for the skills row; no second read.
+    _upsert_skill_row(sb_url, sb_key, skill_id=skill_id, spec=orjson.loads(body))
     return storage_path
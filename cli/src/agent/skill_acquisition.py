@@ -1,10 +1,15 @@
-import json
+import os
 import re
+from bisect import insort
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from jsonschema import ValidationError, validate
+import orjson
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 from agent.dust_client import DustClient
 from agent.platform_memory import (
@@ -17,27 +22,86 @@ from agent.platform_extrapolation import extrapolate_skill_from_platform_map
 from agent.seed_sync import sync_seed_to_supabase
 from agent.skill_spec_utils import normalize_skill_spec
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+# ASCII fast path for _slugify: everything outside [a-z0-9] becomes "-".
+_SLUG_TRANS = str.maketrans(
+    {chr(c): "-" for c in range(128) if not (chr(c).isdigit() or "a" <= chr(c) <= "z")}
+)
+# A row-0 invoice selector with no explicit column field anywhere in it.
+_AMBIGUOUS_ROW_RE = re.compile(
+    r"^(?!.*\[(?:description|item_amount|item_qty)\]).*sales_invoice__row\[0\]",
+    re.DOTALL,
+)
+_FILL_ACTIONS = frozenset(("fill", "fill_if_visible"))
+# (seeds dir, dir mtime_ns) -> sorted ids; any seed added or removed bumps the mtime.
+_SKILL_ID_CACHE: Optional[Tuple[Tuple[str, int], List[str]]] = None
+# Resolved from the repo root, like config's .env, so the cwd does not matter.
+_SKILL_SCHEMA_PATH = Path(__file__).parents[3] / "schemas" / "SkillSpec.schema.json"
+_SKILL_VALIDATOR: Optional[Validator] = None
 
+
+@lru_cache(maxsize=1024)
 def _slugify(text: str, max_len: int = 48) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    lowered = text.lower()
+    if lowered.isascii():
+        parts = lowered.translate(_SLUG_TRANS).split("-")
+        slug = "-".join(part for part in parts if part)
+    else:
+        slug = _SLUG_RE.sub("-", lowered).strip("-")
     if not slug:
         slug = "generated"
     return slug[:max_len].strip("-") or "generated"
 
 
 def _existing_skill_ids() -> List[str]:
-    seed_dir = Path("seeds")
-    if not seed_dir.exists():
+    global _SKILL_ID_CACHE
+    seed_dir = os.path.abspath("seeds")
+    try:
+        key = (seed_dir, os.stat(seed_dir).st_mtime_ns)
+    except FileNotFoundError:
         return []
-    return sorted(path.stem for path in seed_dir.glob("*.json"))
+    if _SKILL_ID_CACHE is None or _SKILL_ID_CACHE[0] != key:
+        with os.scandir(seed_dir) as entries:
+            ids = sorted(
+                entry.name[:-5]
+                for entry in entries
+                if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+            )
+        _SKILL_ID_CACHE = (key, ids)
+    return list(_SKILL_ID_CACHE[1])
+
+
+def _remember_skill_id(seed_dir: Path, skill_id: str) -> None:
+    """Add a seed this process just wrote to the cached listing.
+
+    Coarse directory timestamps may not tick between two writes, so the mtime
+    key alone could keep serving a listing without the new id.
+    """
+    if _SKILL_ID_CACHE is None or _SKILL_ID_CACHE[0][0] != os.path.abspath(seed_dir):
+        return
+    ids = _SKILL_ID_CACHE[1]
+    if skill_id not in ids:
+        insort(ids, skill_id)
 
 
 def _load_skill_schema() -> Optional[Dict[str, Any]]:
-    schema_path = Path("schemas/SkillSpec.schema.json")
-    if not schema_path.exists():
+    if not _SKILL_SCHEMA_PATH.exists():
         return None
-    with open(schema_path, "r", encoding="utf-8") as sf:
-        return json.load(sf)
+    return orjson.loads(_SKILL_SCHEMA_PATH.read_bytes())
+
+
+def _skill_validator() -> Optional[Validator]:
+    """Build the SkillSpec validator once; the schema is checked only here."""
+    global _SKILL_VALIDATOR
+    if _SKILL_VALIDATOR is None:
+        schema = _load_skill_schema()
+        # A missing schema is not cached, so a later call can still find it.
+        if schema is None:
+            return None
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        _SKILL_VALIDATOR = cls(schema)
+    return _SKILL_VALIDATOR
 
 
 def _ensure_unique_skill_id(candidate: str) -> str:
@@ -52,18 +116,13 @@ def _has_ambiguous_invoice_row_selector(skill_spec: Dict[str, Any]) -> bool:
     steps = skill_spec.get("steps") or []
     if not isinstance(steps, list):
         return False
-    for step in steps:
-        if not isinstance(step, dict):
-            continue
-        if step.get("action") not in {"fill", "fill_if_visible"}:
-            continue
-        selector = str(step.get("selector") or "").lower()
-        if "sales_invoice__row[0]" in selector and not any(
-            part in selector
-            for part in ("[description]", "[item_amount]", "[item_qty]")
-        ):
-            return True
-    return False
+    search = _AMBIGUOUS_ROW_RE.search
+    return any(
+        isinstance(step, dict)
+        and step.get("action") in _FILL_ACTIONS
+        and search(str(step.get("selector") or "").lower()) is not None
+        for step in steps
+    )
 
 
 def synthesize_skill_for_prompt(
@@ -146,17 +205,20 @@ def synthesize_skill_for_prompt(
     if not skill_spec.get("steps"):
         raise RuntimeError("Synthesized skill has no steps.")
 
-    schema = _load_skill_schema()
-    if schema is not None:
-        try:
-            validate(instance=skill_spec, schema=schema)
-        except ValidationError as exc:
-            raise RuntimeError(f"Synthesized skill failed schema validation: {exc.message}")
+    validator = _skill_validator()
+    if validator is not None:
+        error = best_match(validator.iter_errors(skill_spec))
+        if error is not None:
+            raise RuntimeError(
+                f"Synthesized skill failed schema validation: {error.message}"
+            )
 
     seed_path = Path("seeds") / f"{skill_spec['id']}.json"
     seed_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(seed_path, "w", encoding="utf-8") as f:
-        json.dump(skill_spec, f, indent=2)
+    tmp_path = seed_path.with_suffix(".json.tmp")
+    tmp_path.write_bytes(orjson.dumps(skill_spec, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, seed_path)
+    _remember_skill_id(seed_path.parent, skill_spec["id"])
     seed_storage_key: Optional[str] = None
     try:
         seed_storage_key = sync_seed_to_supabase(
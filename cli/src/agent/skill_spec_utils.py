@@ -19,78 +19,60 @@ SUPPORTED_ACTIONS = {
 }
 
 
-def _normalize_step(step: Dict[str, Any]) -> Dict[str, Any]:
-    action = str(step.get("action") or "").strip()
-    params = step.get("params")
-    if not isinstance(params, dict):
-        params = {}
-    args = step.get("args")
-    if not isinstance(args, dict):
-        args = {}
-
-    def _pick(key: str) -> Any:
-        if key in step and step.get(key) is not None:
-            return step.get(key)
-        if key in params and params.get(key) is not None:
-            return params.get(key)
-        if key in args and args.get(key) is not None:
-            return args.get(key)
-        return None
-
-    # Map common aliases to runtime actions.
-    if action in {"navigate", "open_url"}:
-        action = "goto"
-    elif action == "wait_for_selector":
-        action = "wait"
+_ACTION_ALIASES = {
+    "navigate": "goto",
+    "open_url": "goto",
+    "wait_for_selector": "wait",
+}
 
-    normalized: Dict[str, Any] = {"action": action}
 
-    selector = _pick("selector")
-    value = _pick("value")
-
-    # Canonical url handling.
-    if action == "goto" and value is None:
-        value = _pick("url")
-    if action == "wait_for_url" and value is None:
-        value = _pick("url")
-
-    # Canonical wait duration handling.
-    timeout = _pick("timeout")
-    if timeout is None and action == "wait":
-        timeout = _pick("duration")
-
-    search = _pick("search")
-    result = _pick("result")
-    store_as = _pick("store_as")
-    items = _pick("items")
-    skill = _pick("skill")
-    optional = _pick("optional")
-    skip_if_exists = _pick("skip_if_exists")
-
-    if selector is not None:
-        normalized["selector"] = str(selector)
-    if value is not None:
-        normalized["value"] = str(value)
-    if timeout is not None:
+# action -> (field, fallback key read when the field itself is missing)
+_ACTION_FALLBACKS = {
+    "goto": ("value", "url"),
+    "wait_for_url": ("value", "url"),
+    "wait": ("timeout", "duration"),
+}
+# Output fields in order, with the coercion applied to each.
+_FIELD_CASTS = (
+    ("selector", str),
+    ("value", str),
+    ("timeout", int),
+    ("search", str),
+    ("result", str),
+    ("store_as", str),
+    ("items", str),
+    ("skill", str),
+    ("optional", bool),
+    ("skip_if_exists", bool),
+)
+
+
+def _normalize_step(step: Dict[str, Any], action: str) -> Dict[str, Any]:
+    """Normalize `step` whose alias-resolved action is `action`."""
+    # One merged view: step wins over params, params over args; None never wins.
+    merged: Dict[str, Any] = {}
+    for source in (step.get("args"), step.get("params"), step):
+        if isinstance(source, dict):
+            for key, val in source.items():
+                if val is not None:
+                    merged[key] = val
+
+    fallback = _ACTION_FALLBACKS.get(action)
+    if fallback is not None:
+        field, alternate = fallback
+        if field not in merged and alternate in merged:
+            merged[field] = merged[alternate]
+
+    normalized: Dict[str, Any] = {"action": action}
+    for field, cast in _FIELD_CASTS:
+        val = merged.get(field)
+        if val is None:
+            continue
         try:
-            normalized["timeout"] = int(timeout)
+            normalized[field] = cast(val)
         except Exception:
+            # Only int() can fail; an unparsable timeout is dropped.
             pass
-    if search is not None:
-        normalized["search"] = str(search)
-    if result is not None:
-        normalized["result"] = str(result)
-    if store_as is not None:
-        normalized["store_as"] = str(store_as)
-    if items is not None:
-        normalized["items"] = str(items)
-    if skill is not None:
-        normalized["skill"] = str(skill)
-    if optional is not None:
-        normalized["optional"] = bool(optional)
-    if skip_if_exists is not None:
-        normalized["skip_if_exists"] = bool(skip_if_exists)
-
     return normalized
 
 
@@ -132,14 +114,19 @@ def normalize_skill_spec(
         steps = []
 
     runtime_steps: List[Dict[str, Any]] = []
+    supported = SUPPORTED_ACTIONS
+    aliases = _ACTION_ALIASES
+    normalize_step = _normalize_step
+    append = runtime_steps.append
     for step in steps:
         if not isinstance(step, dict):
             continue
-        normalized_step = _normalize_step(step)
-        action = normalized_step.get("action")
-        if action not in SUPPORTED_ACTIONS:
-            continue
-        runtime_steps.append(normalized_step)
+        # Map common aliases to runtime actions; unsupported steps are dropped
+        # before any field work.
+        action = str(step.get("action") or "").strip()
+        action = aliases.get(action, action)
+        if action in supported:
+            append(normalize_step(step, action))
 
     normalized["steps"] = runtime_steps
 
@@ -1,10 +1,56 @@
-import json
+import io
 import re
 import zipfile
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from urllib.parse import urlparse
 
+import orjson
+
+_NAME_RE = re.compile(r"\[name=['\"]([^'\"]+)['\"]\]")
+_ID_RE = re.compile(r"#([A-Za-z0-9_\-]+)")
+_BRACKET_IDX_RE = re.compile(r"\[\d+\]\[")
+_NON_ALNUM_RE = re.compile(r"[^A-Za-z0-9_]+")
+_DATE_DMY_RE = re.compile(r"^\d{2}[./-]\d{2}[./-]\d{4}$")
+_DATE_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Default cap on events kept by install_user_interaction_recorder.
+MAX_RECORDED_EVENTS = 10000
+
+# Mining runs usually share one platform origin, so the same URL is parsed repeatedly.
+_cached_urlparse = lru_cache(maxsize=256)(urlparse)
+
+_TRACE_METHODS = frozenset(
+    {
+        "goto",
+        "click",
+        "fill",
+        "type",
+        "selectOption",
+        "waitForSelector",
+        "waitForURL",
+        "press",
+    }
+)
+# Byte-level prefilter so unwanted trace records are rejected before JSON parsing.
+_TRACE_METHOD_RE = re.compile(
+    rb'"method"\s*:\s*"(?:'
+    + b"|".join(m.encode() for m in sorted(_TRACE_METHODS))
+    + rb')"'
+)
+
 RECORDER_INIT_SCRIPT = r"""
 (() => {
   if (window.__agentRecorderInstalled) return;
@@ -130,29 +176,49 @@ RECORDER_INIT_SCRIPT = r"""
 """
 
 
-def install_user_interaction_recorder(context: Any, sink: List[Dict[str, Any]]) -> None:
+def install_user_interaction_recorder(
+    context: Any,
+    sink: MutableSequence[Dict[str, Any]],
+    max_events: int = MAX_RECORDED_EVENTS,
+) -> None:
     def _emit(_source: Any, payload: Any) -> None:
-        if isinstance(payload, dict):
+        if not isinstance(payload, dict):
+            return
+        # Key-by-key typing into one field keeps only the latest input event.
+        if (
+            payload.get("type") == "input"
+            and sink
+            and sink[-1].get("type") == "input"
+            and sink[-1].get("selector") == payload.get("selector")
+        ):
+            sink[-1] = payload
+        # Stop at the cap rather than evicting: the first events carry the
+        # start URL that the mined goto step is built from.
+        elif len(sink) < max_events:
             sink.append(payload)
 
     context.expose_binding("__agentEmit", _emit)
     context.add_init_script(RECORDER_INIT_SCRIPT)
 
 
-def parse_trace_zip_actions(trace_zip_path: Path, max_events: int = 2000) -> List[Dict[str, Any]]:
+def iter_trace_zip_actions(trace_zip_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield actionable API calls from a trace zip lazily, in trace order."""
     if not trace_zip_path.exists():
-        return []
+        return
 
-    events: List[Dict[str, Any]] = []
     with zipfile.ZipFile(trace_zip_path, "r") as zf:
         if "trace.trace" not in zf.namelist():
-            return []
+            return
 
         with zf.open("trace.trace", "r") as trace_file:
-            for raw_line in trace_file:
+            for raw_line in io.BufferedReader(trace_file, buffer_size=1 << 20):
+                # Most records are "after"/metadata or unwanted calls; skip them
+                # before parsing.
+                if b'"before"' not in raw_line or not _TRACE_METHOD_RE.search(raw_line):
+                    continue
                 try:
-                    event = json.loads(raw_line.decode("utf-8"))
-                except Exception:
+                    event = orjson.loads(raw_line)
+                except orjson.JSONDecodeError:
                     continue
 
                 if event.get("type") != "before":
@@ -164,16 +230,7 @@ def parse_trace_zip_actions(trace_zip_path: Path, max_events: int = 2000) -> Lis
                 if not isinstance(params, dict):
                     params = {}
 
-                if method not in {
-                    "goto",
-                    "click",
-                    "fill",
-                    "type",
-                    "selectOption",
-                    "waitForSelector",
-                    "waitForURL",
-                    "press",
-                }:
+                if method not in _TRACE_METHODS:
                     continue
 
                 parsed: Dict[str, Any] = {
@@ -193,70 +250,88 @@ def parse_trace_zip_actions(trace_zip_path: Path, max_events: int = 2000) -> Lis
                         or params.get("values")
                     )
 
-                events.append(parsed)
-                if len(events) >= max_events:
-                    break
-    return events
+                yield parsed
+
+
+def parse_trace_zip_actions(trace_zip_path: Path, max_events: int = 2000) -> List[Dict[str, Any]]:
+    return list(islice(iter_trace_zip_actions(trace_zip_path), max_events))
 
 
 def build_trace_summary(
-    interaction_events: List[Dict[str, Any]],
-    trace_events: List[Dict[str, Any]],
+    interaction_events: Sequence[Dict[str, Any]],
+    trace_events: Iterable[Dict[str, Any]],
     max_lines: int = 120,
 ) -> str:
+    # trace_events may be lazy (see iter_trace_zip_actions); only max_lines
+    # events are ever pulled from it.
     lines: List[str] = []
     stream = interaction_events if interaction_events else trace_events
-    for idx, event in enumerate(stream[:max_lines], start=1):
+    for idx, event in enumerate(islice(stream, max_lines), start=1):
         evt_type = str(event.get("type") or "unknown")
         url = str(event.get("url") or "")
         selector = str(event.get("selector") or "")
         value = str(event.get("value") or event.get("text") or "")
 
-        bits = [f"{idx:03d}. {evt_type}"]
-        if selector:
-            bits.append(f"selector={selector}")
-        if value:
-            bits.append(f"value={value}")
-        if url:
-            bits.append(f"url={url}")
-        lines.append(" | ".join(bits))
+        lines.append(
+            f"{idx:03d}. {evt_type}"
+            f"{f' | selector={selector}' if selector else ''}"
+            f"{f' | value={value}' if value else ''}"
+            f"{f' | url={url}' if url else ''}"
+        )
 
     if not lines:
         return "No actionable events captured."
     return "\n".join(lines)
 
 
-def _selector_to_slot_name(selector: str, fallback_index: int) -> str:
-    if not selector:
-        return f"field_{fallback_index}"
-
-    name_match = re.search(r"\[name=['\"]([^'\"]+)['\"]\]", selector)
+@lru_cache(maxsize=4096)
+def _selector_raw_name(selector: str) -> Optional[str]:
+    """Reduce a selector to a slot-name stem; None when nothing usable remains."""
+    name_match = _NAME_RE.search(selector)
     if name_match:
         raw = name_match.group(1)
     else:
-        id_match = re.search(r"#([A-Za-z0-9_\-]+)", selector)
+        id_match = _ID_RE.search(selector)
         raw = id_match.group(1) if id_match else selector
 
     raw = raw.replace("sales_invoice__", "")
-    raw = re.sub(r"\[\d+\]\[", "_", raw)
+    raw = _BRACKET_IDX_RE.sub("_", raw)
     raw = raw.replace("[", "_").replace("]", "")
-    raw = re.sub(r"[^A-Za-z0-9_]+", "_", raw).strip("_").lower()
-    if not raw:
-        raw = f"field_{fallback_index}"
-    return raw
+    raw = _NON_ALNUM_RE.sub("_", raw).strip("_").lower()
+    return raw or None
+
+
+def _selector_to_slot_name(selector: str, fallback_index: int) -> str:
+    if not selector:
+        return f"field_{fallback_index}"
+    return _selector_raw_name(selector) or f"field_{fallback_index}"
 
 
 def _looks_like_date(selector: str, value: str) -> bool:
     text = f"{selector} {value}".lower()
     if "date" in text or "deadline" in text or "due" in text:
         return True
-    if re.match(r"^\d{2}[./-]\d{2}[./-]\d{4}$", value):
+    if _DATE_DMY_RE.match(value):
         return True
-    if re.match(r"^\d{4}-\d{2}-\d{2}$", value):
+    if _DATE_ISO_RE.match(value):
         return True
     return False
 
 
+_HANDLED_EVENT_TYPES = frozenset(("click", "input", "change"))
+
+
+def _event_fields(event: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """(selector, value, text, tag) of an interaction event, normalized."""
+    get = event.get
+    return (
+        str(get("selector") or ""),
+        str(get("value") or "").strip(),
+        str(get("text") or "").strip(),
+        str(get("tag") or "").strip().lower(),
+    )
+
+
 def _step_key(step: Dict[str, Any]) -> Tuple[Any, ...]:
     return (
         step.get("action"),
@@ -272,28 +347,42 @@ def infer_skill_from_events(
     base_url: str,
     interaction_events: List[Dict[str, Any]],
 ) -> Dict[str, Any]:
-    # Use active interaction stream first; if empty, fallback to API events.
-    stream = [e for e in interaction_events if isinstance(e, dict)]
+    # One pass over the events: the goto URL is filled in once the loop has seen
+    # the first absolute URL. emit() never produces goto steps, so the
+    # placeholder's dedup key cannot swallow a real step.
+    goto_step: Dict[str, Any] = {"action": "goto", "value": ""}
     first_url = ""
-    for event in stream:
-        url = str(event.get("url") or "")
-        if url.startswith("http"):
-            first_url = url
-            break
-    goto_url = first_url or base_url
-
-    steps: List[Dict[str, Any]] = [{"action": "goto", "value": goto_url}]
+    steps: List[Dict[str, Any]] = [goto_step]
     slot_props: Dict[str, Any] = {}
     required: List[str] = []
+    placeholders: Dict[str, str] = {}
     slot_idx = 1
     last_select2_container = ""
+    steps_append = steps.append
+    last_key: Tuple[Any, ...] = _step_key(steps[0])
 
-    for event in stream:
-        evt_type = str(event.get("type") or "")
-        selector = str(event.get("selector") or "")
-        value = str(event.get("value") or "").strip()
-        text = str(event.get("text") or "").strip()
-        tag = str(event.get("tag") or "").strip().lower()
+    def emit(step: Dict[str, Any]) -> None:
+        # Drop back-to-back duplicates from noisy inputs as steps are produced.
+        nonlocal last_key
+        key = _step_key(step)
+        if key != last_key:
+            steps_append(step)
+            last_key = key
+
+    required_append = required.append
+
+    for event in interaction_events:
+        if not isinstance(event, dict):
+            continue
+        if not first_url:
+            url = str(event.get("url") or "")
+            if url.startswith("http"):
+                first_url = url
+        # page_loaded/submit and other noise are rejected before any field work.
+        evt_type = event.get("type")
+        if not isinstance(evt_type, str) or evt_type not in _HANDLED_EVENT_TYPES:
+            continue
+        selector, value, text, tag = _event_fields(event)
 
         if evt_type == "click":
             if "select2-selection" in selector:
@@ -301,13 +390,12 @@ def infer_skill_from_events(
                 continue
 
             if selector:
-                steps.append({"action": "click", "selector": selector})
+                emit({"action": "click", "selector": selector})
             elif text:
-                steps.append({"action": "click", "selector": f"text={text}"})
+                emit({"action": "click", "selector": f"text={text}"})
             continue
 
-        if evt_type not in {"input", "change"}:
-            continue
+        # input / change
         if not selector:
             continue
         if value in {"", "<redacted>"}:
@@ -316,19 +404,21 @@ def infer_skill_from_events(
         if "select2-search__field" in selector and last_select2_container:
             slot_name = _selector_to_slot_name(last_select2_container, slot_idx)
             slot_idx += 1
-            slot_props.setdefault(
-                slot_name, {"type": "string", "description": f"Value for {slot_name}"}
-            )
-            slot_props[slot_name]["default"] = value
-            if slot_name not in required:
-                required.append(slot_name)
-
-            steps.append(
+            prop = slot_props.get(slot_name)
+            if prop is None:
+                # slot_props and required gain a slot together, so no list scan.
+                prop = {"type": "string", "description": f"Value for {slot_name}"}
+                slot_props[slot_name] = prop
+                required_append(slot_name)
+                placeholders[slot_name] = "{{" + slot_name + "}}"
+            prop["default"] = value
+
+            emit(
                 {
                     "action": "select2",
                     "selector": last_select2_container,
                     "search": "input.select2-search__field",
-                    "value": f"{{{{{slot_name}}}}}",
+                    "value": placeholders[slot_name],
                     "result": ".select2-results__option--highlighted",
                 }
             )
@@ -337,47 +427,29 @@ def infer_skill_from_events(
 
         slot_name = _selector_to_slot_name(selector, slot_idx)
         slot_idx += 1
-        slot_props.setdefault(
-            slot_name, {"type": "string", "description": f"Value for {slot_name}"}
-        )
-        slot_props[slot_name]["default"] = value
-        if slot_name not in required:
-            required.append(slot_name)
-
+        prop = slot_props.get(slot_name)
+        if prop is None:
+            prop = {"type": "string", "description": f"Value for {slot_name}"}
+            slot_props[slot_name] = prop
+            required_append(slot_name)
+            placeholders[slot_name] = "{{" + slot_name + "}}"
+        prop["default"] = value
+
+        placeholder = placeholders[slot_name]
         if tag == "select" or "select" in selector:
-            steps.append(
-                {
-                    "action": "select_option",
-                    "selector": selector,
-                    "value": f"{{{{{slot_name}}}}}",
-                }
+            emit(
+                {"action": "select_option", "selector": selector, "value": placeholder}
             )
         elif _looks_like_date(selector, value):
-            steps.append(
-                {
-                    "action": "fill_date",
-                    "selector": selector,
-                    "value": f"{{{{{slot_name}}}}}",
-                }
-            )
+            emit({"action": "fill_date", "selector": selector, "value": placeholder})
         else:
-            steps.append(
-                {"action": "fill", "selector": selector, "value": f"{{{{{slot_name}}}}}"}
-            )
-
-    # Remove back-to-back duplicates from noisy inputs.
-    compact_steps: List[Dict[str, Any]] = []
-    seen_prev: Optional[Tuple[Any, ...]] = None
-    for step in steps:
-        key = _step_key(step)
-        if key == seen_prev:
-            continue
-        compact_steps.append(step)
-        seen_prev = key
+            emit({"action": "fill", "selector": selector, "value": placeholder})
 
-    compact_steps.append({"action": "screenshot"})
+    steps_append({"action": "screenshot"})
+    goto_url = first_url or base_url
+    goto_step["value"] = goto_url
 
-    parsed = urlparse(goto_url if goto_url.startswith("http") else base_url)
+    parsed = _cached_urlparse(goto_url if goto_url.startswith("http") else base_url)
     skill_name = f"Mined workflow on {parsed.netloc or 'platform'}"
     return {
         "id": skill_id,
@@ -385,7 +457,7 @@ def infer_skill_from_events(
         "name": skill_name,
         "description": "Auto-mined from real mimic interaction events.",
         "base_url": f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme and parsed.netloc else base_url,
-        "steps": compact_steps,
+        "steps": steps,
         "slots_schema": {
             "type": "object",
             "required": required,
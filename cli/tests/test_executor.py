@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import pytest
+
+from agent import executor as ex
+from agent.executor import SkillExecutor, _first_visible_by_priority
+
+
+@pytest.fixture
+def skill_executor(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    runner = SkillExecutor("test-run")
+    actions = []
+    monkeypatch.setattr(
+        runner, "log_action", lambda action, details: actions.append(details)
+    )
+    runner.logged = actions
+    return runner
+
+
+def test_resolve_value_substitutes_known_slots(skill_executor):
+    slots = {"customer": "ACME", "amount": 1200}
+    assert skill_executor._resolve_value("{{customer}}: {{amount}} EUR", slots) == (
+        "ACME: 1200 EUR"
+    )
+
+
+def test_resolve_value_drops_value_with_unresolved_placeholder(skill_executor):
+    value = skill_executor._resolve_value(
+        "{{customer}} / {{missing}}", {"customer": "ACME"}
+    )
+
+    assert value == ""
+    # The known slot is filled in; the unknown one is kept verbatim in the log.
+    assert skill_executor.logged == ["unresolved placeholder in 'ACME / {{missing}}'"]
+
+
+def test_resolve_value_does_not_substitute_inside_slot_values(skill_executor):
+    slots = {"description": "{{amount}}", "amount": "1200"}
+
+    assert skill_executor._resolve_value("{{description}}", slots) == "{{amount}}"
+    assert skill_executor.logged == []
+
+
+def test_resolve_value_passes_none_and_non_strings_through(skill_executor):
+    assert skill_executor._resolve_value(None, {}) == ""
+    assert skill_executor._resolve_value("", {}) == ""
+    assert skill_executor._resolve_value(3, {}) == 3
+    assert skill_executor._resolve_value("{{qty}}x", {"qty": 2}) == "2x"
+
+
+class _FixedDatetime(datetime):
+    current = datetime(2026, 3, 1, 9, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def test_today_defaults_are_cached_per_day(monkeypatch):
+    monkeypatch.setattr(ex, "datetime", _FixedDatetime)
+    monkeypatch.setattr(SkillExecutor, "_DEFAULTS_CACHE", {})
+
+    first = SkillExecutor._today_defaults()
+    assert first["invoice_date"] == "01.03.2026"
+    assert first["payment_deadline"] == "15.03.2026"
+
+    monkeypatch.setattr(_FixedDatetime, "current", datetime(2026, 3, 1, 23, 59))
+    assert SkillExecutor._today_defaults() is first
+
+    monkeypatch.setattr(_FixedDatetime, "current", datetime(2026, 3, 2, 0, 1))
+    rolled = SkillExecutor._today_defaults()
+    assert rolled is not first
+    assert rolled["invoice_date"] == "02.03.2026"
+    assert list(SkillExecutor._DEFAULTS_CACHE) == [datetime(2026, 3, 2).date()]
+
+    with pytest.raises(TypeError):
+        rolled["currency"] = "USD"
+
+
+class _FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def locator(self, selector):
+        assert selector == "visible=true"
+        return self
+
+    @property
+    def first(self):
+        return self
+
+    def matched(self):
+        # A joined selector matches whichever element comes first in the DOM.
+        wanted = self.selector.split(", ")
+        return next((el for el in self.page.visible_dom if el in wanted), None)
+
+    def is_visible(self):
+        return self.matched() is not None
+
+
+class _FakePage:
+    def __init__(self, visible_dom):
+        self.visible_dom = visible_dom
+
+    def locator(self, selector):
+        return _FakeLocator(self, selector)
+
+
+def test_first_visible_by_priority_prefers_earlier_selector_over_dom_order():
+    selectors = ("#accept", "#agree", "#ok")
+    page = _FakePage(visible_dom=["#ok", "#agree"])
+
+    assert _FakeLocator(page, ", ".join(selectors)).matched() == "#ok"
+    locator = _first_visible_by_priority(page, selectors, ", ".join(selectors))
+    assert locator.matched() == "#agree"
+
+
+def test_first_visible_by_priority_returns_none_when_nothing_is_visible():
+    selectors = ("#accept", "#agree")
+    page = _FakePage(visible_dom=["#other"])
+
+    assert _first_visible_by_priority(page, selectors, ", ".join(selectors)) is None
@@ -1,6 +1,7 @@
 import httpx
 
 from agent.gemini import check_gemini_connectivity
+from agent.http_client import get_client
 
 
 def test_gemini_check_missing_key():
@@ -24,7 +25,7 @@ def test_gemini_check_leaked_key_message(monkeypatch):
             },
         )
 
-    monkeypatch.setattr(httpx, "get", fake_get)
+    monkeypatch.setattr(get_client(), "get", fake_get)
     ok, details = check_gemini_connectivity("AIzaSy-test")
     assert ok is False
     assert "flagged as leaked" in details
@@ -44,7 +45,7 @@ def test_gemini_check_falls_back_to_query_param(monkeypatch):
             )
         return httpx.Response(200, request=request, json={"models": []})
 
-    monkeypatch.setattr(httpx, "get", fake_get)
+    monkeypatch.setattr(get_client(), "get", fake_get)
     ok, details = check_gemini_connectivity("AIzaSy-test")
     assert ok is True
     assert details == "ok"
@@ -1,4 +1,7 @@
-from agent.invoice_utils import parse_invoice_prompt
+import httpx
+
+from agent.http_client import get_client
+from agent.invoice_utils import parse_invoice_prompt, validate_vat_id
 from agent.scheduler import cron_for_frequency
 
 
@@ -24,3 +27,38 @@ def test_parse_invoice_prompt_avoids_false_vat_match():
     prompt = "Create a quarterly invoice for ACME with reduced tax."
     slots = parse_invoice_prompt(prompt)
     assert "vat_id" not in slots
+
+
+def test_parse_invoice_prompt_keeps_category_priority():
+    slots = parse_invoice_prompt("Monthly invoice, standard rate, weekly reminder, reverse charge")
+    assert slots["period"] == "weekly"
+    assert slots["tax_rule"] == "reverse_charge"
+
+
+def test_validate_vat_id_caches_successful_lookups(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, timeout=15.0):
+        calls.append(params)
+        request = httpx.Request("GET", url, params=params)
+        return httpx.Response(200, request=request, json={"valid": True})
+
+    validate_vat_id.cache_clear()
+    monkeypatch.setattr(get_client(), "get", fake_get)
+    first = validate_vat_id("IE6388047V")
+    first["valid"] = False
+    second = validate_vat_id("IE6388047V")
+
+    assert second["valid"] is True
+    assert len(calls) == 1
+    validate_vat_id.cache_clear()
+
+
+def test_parse_invoice_prompt_uppercases_lowercase_vat_id():
+    slots = parse_invoice_prompt("Invoice ACME, vat ie6388047v, reverse charge")
+    assert slots["vat_id"] == "IE6388047V"
+
+
+def test_parse_invoice_prompt_skips_vat_shaped_words():
+    slots = parse_invoice_prompt("Quarterly invoice for customer ACME, VAT IE6388047V")
+    assert slots["vat_id"] == "IE6388047V"
@@ -0,0 +1,55 @@
+import queue
+
+from agent.http_client import get_client
+from agent.logger import EventLogger
+
+
+def test_events_are_posted_in_batches(monkeypatch):
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=5.0):
+        calls.append(json)
+
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "eyJ.service")
+    monkeypatch.setattr(get_client(), "post", fake_post)
+    monkeypatch.setattr(EventLogger, "_batch_size", 2)
+
+    EventLogger.log("a", "first")
+    EventLogger.log("b", "second")
+    EventLogger.log("c", "third")
+    EventLogger.flush()
+
+    posted = sorted(record["event_type"] for batch in calls for record in batch)
+    assert posted == ["a", "b", "c"]
+    assert all(len(batch) <= 2 for batch in calls)
+
+    EventLogger.log("d", "fourth")
+    EventLogger.flush()
+    assert calls[-1][-1]["event_type"] == "d"
+
+
+def test_log_is_a_noop_without_supabase(monkeypatch):
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    EventLogger.log("ignored", "no credentials")
+    assert EventLogger._queue.empty()
+
+
+def test_full_queue_posts_synchronously(monkeypatch):
+    calls = []
+
+    def fake_post(url, headers=None, json=None, timeout=5.0):
+        calls.append(json)
+
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "eyJ.service")
+    monkeypatch.setattr(get_client(), "post", fake_post)
+    monkeypatch.setattr(EventLogger, "_ensure_worker", classmethod(lambda cls: None))
+    monkeypatch.setattr(EventLogger, "_queue", queue.Queue(maxsize=1))
+
+    EventLogger.log("queued", "fits in the queue")
+    EventLogger.log("overflow", "queue is full")
+
+    assert [record["event_type"] for batch in calls for record in batch] == ["overflow"]
+    EventLogger.flush()
+    assert calls[-1][0]["event_type"] == "queued"
@@ -0,0 +1,92 @@
+import importlib
+import inspect
+import os
+import sys
+
+import typer
+from typer.testing import CliRunner
+
+from agent.logger import load_env_robust
+from agent.main import AUTH_COMMANDS, CLOUD_COMMANDS, COMMANDS, app
+
+
+def test_lazy_group_lists_and_resolves_commands():
+    group = typer.main.get_command(app)
+    ctx = group.make_context("agent", ["--help"], resilient_parsing=True)
+
+    names = group.list_commands(ctx)
+    assert names[: len(COMMANDS)] == list(COMMANDS)
+    assert names[-2:] == ["auth", "cloud"]
+
+    placeholder = group.get_command(ctx, "loop")
+    assert placeholder.name == "loop"
+    assert placeholder.help == COMMANDS["loop"][1]
+    assert placeholder.params == []
+    assert group.get_command(ctx, "missing") is None
+
+    name, command, rest = group.resolve_command(ctx, ["loop", "goal"])
+    assert (name, rest) == ("loop", ["goal"])
+    assert "iters" in [param.name for param in command.params]
+
+
+def test_root_help_imports_no_command_modules(monkeypatch):
+    for module in list(sys.modules):
+        if module.startswith("agent.commands."):
+            monkeypatch.delitem(sys.modules, module)
+
+    result = CliRunner().invoke(app, ["--help"])
+
+    assert result.exit_code == 0
+    assert "Validate environment" in result.output
+    assert not [m for m in sys.modules if m.startswith("agent.commands.")]
+
+
+def test_group_help_does_not_load_dotenv(monkeypatch, tmp_path):
+    (tmp_path / ".env").write_text("ENVOICE_USERNAME=from-dotenv\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ENVOICE_USERNAME", "")
+    monkeypatch.delenv("ENVOICE_USERNAME")
+    load_env_robust.cache_clear()
+    try:
+        result = CliRunner().invoke(app, ["auth", "--help"])
+    finally:
+        load_env_robust.cache_clear()
+
+    assert result.exit_code == 0
+    assert "ENVOICE_USERNAME" not in os.environ
+
+
+def test_lazy_command_import_sees_cwd_dotenv(monkeypatch, tmp_path):
+    (tmp_path / ".env").write_text(
+        "CLOUDFLARE_API_TOKEN=from-dotenv\n"
+        "CLOUDFLARE_ACCOUNT_ID=from-dotenv\n"
+        "SUPABASE_URL=https://dotenv.supabase.co\n",
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+    for name in ("CLOUDFLARE_API_TOKEN", "CLOUDFLARE_ACCOUNT_ID", "SUPABASE_URL"):
+        # setenv records the original value, so whatever dotenv writes is
+        # undone at teardown even when the variable was unset before.
+        monkeypatch.setenv(name, "")
+        monkeypatch.delenv(name)
+    # Force a fresh import of the config-building command and its settings.
+    for module in ("agent.config", "agent.commands.smoke"):
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    load_env_robust.cache_clear()
+    try:
+        group = typer.main.get_command(app)
+        ctx = group.make_context("agent", ["--help"], resilient_parsing=True)
+        _, command, _ = group.resolve_command(ctx, ["smoke-local"])
+    finally:
+        load_env_robust.cache_clear()
+
+    assert command.name == "smoke-local"
+    assert sys.modules["agent.config"].config.SUPABASE_URL == "https://dotenv.supabase.co"
+
+
+def test_static_help_matches_command_docstrings():
+    for commands in (COMMANDS, AUTH_COMMANDS, CLOUD_COMMANDS):
+        for target, help_text in commands.values():
+            module_name, attr = target.split(":")
+            func = getattr(importlib.import_module(module_name), attr)
+            assert inspect.getdoc(func).splitlines()[0] == help_text
@@ -40,3 +40,48 @@ def test_platform_memory_merge_and_persist(monkeypatch, tmp_path):
     digest = pm.platform_map_digest(reloaded, top_n=5)
     assert "top_selectors" in digest
     assert "/desktop/sale/add" in digest["top_paths"]
+
+
+def test_url_path_with_query_matches_urlparse_shape():
+    assert pm._url_path_with_query("https://app.envoice.eu/desktop/sale/add") == (
+        "/desktop/sale/add"
+    )
+    assert pm._url_path_with_query("https://app.envoice.eu") == "/"
+    assert pm._url_path_with_query("https://app.envoice.eu?tab=2#top") == "/?tab=2"
+    assert pm._url_path_with_query("https://app.envoice.eu/a;v=1?q=1") == "/a?q=1"
+
+
+def test_normalize_recent_events_keeps_shaped_events_and_fills_missing_fields():
+    shaped = {
+        "type": "click",
+        "url": "u",
+        "selector": "#a",
+        "text": None,
+        "value": None,
+        "ts": 1,
+    }
+    raw = {"type": "fill", "selector": "#b", "value": "x", "extra": True}
+
+    events = pm._normalize_recent_events([raw, shaped, raw], cap=2)
+
+    assert events[0] is shaped
+    assert events[1] == {
+        "type": "fill",
+        "url": None,
+        "selector": "#b",
+        "text": None,
+        "value": "x",
+        "ts": None,
+    }
+
+
+def test_merge_platform_signals_adds_to_stored_counts():
+    data = {"signals": {"selectors": {"#save": 2}, "actions": {"click": 2}, "paths": {}}}
+    events = [{"type": "click", "selector": "#save", "url": "https://x.eu/a"}]
+
+    merged = pm.merge_platform_signals(data, "", events, "", "mine")
+    merged = pm.merge_platform_signals(merged, "", events, "", "mine")
+
+    signals = merged["signals"]
+    assert signals == {"selectors": {"#save": 4}, "actions": {"click": 4}, "paths": {"/a": 2}}
+    assert all(type(counts) is dict for counts in signals.values())
@@ -1,3 +1,5 @@
+from agent import seed_sync
+from agent.http_client import get_client
 from agent.seed_sync import _seed_storage_path
 
 
@@ -9,3 +11,32 @@ def test_seed_storage_path_sanitizes_slashes():
     assert _seed_storage_path("envoice.sales_invoice.existing") == (
         "artifacts/seeds/envoice.sales_invoice.existing.json"
     )
+
+
+def test_sync_seed_reads_file_once_and_upserts_decoded_spec(monkeypatch, tmp_path):
+    seed = tmp_path / "seed.json"
+    seed.write_bytes(b'{"id": "envoice.sales_invoice", "version": 3}')
+    calls = []
+
+    class _Resp:
+        def raise_for_status(self):
+            pass
+
+    def fake_post(url, headers=None, json=None, content=None, timeout=None):
+        calls.append((url, json, content))
+        return _Resp()
+
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "eyJ.service")
+    monkeypatch.setattr(get_client(), "post", fake_post)
+
+    path = seed_sync.sync_seed_to_supabase("envoice/sales", seed)
+
+    assert path == "artifacts/seeds/envoice__sales.json"
+    assert calls[0][2] == seed.read_bytes()
+    assert calls[1][1] == {
+        "id": "envoice.sales_invoice",
+        "version": 3,
+        "spec": {"id": "envoice.sales_invoice", "version": 3},
+    }
+    assert seed_sync.sync_seed_to_supabase("x", tmp_path / "missing.json") is None
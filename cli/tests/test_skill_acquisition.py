@@ -1,4 +1,11 @@
-from agent.skill_acquisition import _has_ambiguous_invoice_row_selector
+import os
+
+from agent import skill_acquisition as sa
+from agent.skill_acquisition import (
+    _existing_skill_ids,
+    _has_ambiguous_invoice_row_selector,
+    _remember_skill_id,
+)
 
 
 def test_detects_ambiguous_invoice_row_selector():
@@ -30,3 +37,52 @@ def test_ignores_explicit_invoice_row_selector():
         ]
     }
     assert _has_ambiguous_invoice_row_selector(spec) is False
+
+
+def test_existing_skill_ids_rescans_only_when_seeds_change(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert _existing_skill_ids() == []
+
+    seeds = tmp_path / "seeds"
+    seeds.mkdir()
+    (seeds / "b.json").write_text("{}")
+    (seeds / "a.json").write_text("{}")
+    (seeds / "notes.txt").write_text("")
+    assert _existing_skill_ids() == ["a", "b"]
+
+    # Same directory mtime -> cached listing, even if the contents changed.
+    mtime_ns = os.stat(seeds).st_mtime_ns
+    (seeds / "c.json").write_text("{}")
+    os.utime(seeds, ns=(mtime_ns, mtime_ns))
+    assert _existing_skill_ids() == ["a", "b"]
+
+    os.utime(seeds, ns=(mtime_ns, mtime_ns + 1))
+    assert _existing_skill_ids() == ["a", "b", "c"]
+
+
+def test_remembered_skill_id_survives_unchanged_mtime(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    seeds = tmp_path / "seeds"
+    seeds.mkdir()
+    (seeds / "a.json").write_text("{}")
+    assert _existing_skill_ids() == ["a"]
+
+    # A write within the same timestamp tick leaves the directory mtime as-is.
+    mtime_ns = os.stat(seeds).st_mtime_ns
+    (seeds / "b.json").write_text("{}")
+    os.utime(seeds, ns=(mtime_ns, mtime_ns))
+    _remember_skill_id(seeds, "b")
+    assert _existing_skill_ids() == ["a", "b"]
+
+
+def test_skill_validator_ignores_cwd_and_retries_missing_schema(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sa, "_SKILL_VALIDATOR", None)
+    schema_path = sa._SKILL_SCHEMA_PATH
+    monkeypatch.setattr(sa, "_SKILL_SCHEMA_PATH", tmp_path / "missing.json")
+    assert sa._skill_validator() is None
+
+    monkeypatch.setattr(sa, "_SKILL_SCHEMA_PATH", schema_path)
+    validator = sa._skill_validator()
+    assert validator is not None
+    assert sa._skill_validator() is validator
@@ -51,3 +51,10 @@ def test_command_for_prompt_learning_task():
     cmd = _command_for_task(task)
     assert cmd[0:2] == ["agent", "extrapolate"]
     assert "--skill-id" in cmd
+
+
+def test_command_for_task_returns_independent_lists():
+    task = SwarmTask(id="r2", skill_id="envoice.sales_invoice.existing", task_type="run")
+    first = _command_for_task(task)
+    first.append("--mutated")
+    assert _command_for_task(task) == ["agent", "run", "envoice.sales_invoice.existing"]
@@ -1,4 +1,12 @@
-from agent.trace_mining import infer_skill_from_events
+import zipfile
+
+from agent.trace_mining import (
+    _selector_to_slot_name,
+    build_trace_summary,
+    infer_skill_from_events,
+    install_user_interaction_recorder,
+    parse_trace_zip_actions,
+)
 
 
 def test_infer_skill_from_events_builds_steps_and_slots():
@@ -43,3 +51,78 @@ def test_infer_skill_from_events_builds_steps_and_slots():
     assert any(step.get("action") == "fill_date" for step in skill["steps"])
     assert any(step.get("action") == "fill" for step in skill["steps"])
     assert skill["slots_schema"]["required"]
+
+
+def test_selector_to_slot_name_falls_back_per_call():
+    selector = "input[name='sales_invoice__row[0][item_qty]']"
+    assert _selector_to_slot_name(selector, 1) == "row_item_qty"
+    assert _selector_to_slot_name("!!!", 3) == "field_3"
+    assert _selector_to_slot_name("!!!", 4) == "field_4"
+    assert _selector_to_slot_name("", 5) == "field_5"
+
+
+def test_parse_trace_zip_actions_keeps_only_wanted_before_calls(tmp_path):
+    lines = [
+        b'{"type":"context-options","browserName":"chromium"}',
+        b'{"type":"before","callId":"1","method":"goto","class":"Frame",'
+        b'"params":{"url":"https://app.envoice.eu/desktop/sale/add"},"startTime":1}',
+        b'{"type":"after","callId":"1","endTime":2}',
+        b'not json "before"',
+        b'{"type": "before", "callId": "2", "method": "selectOption", "class": "Frame",'
+        b' "params": {"selector": "select#currency", "label": "EUR"}, "startTime": 3}',
+        b'{"type":"before","callId":"3","method":"evaluateExpression","params":{}}',
+    ]
+    trace_zip = tmp_path / "trace.zip"
+    with zipfile.ZipFile(trace_zip, "w") as zf:
+        zf.writestr("trace.trace", b"\n".join(lines) + b"\n")
+
+    events = parse_trace_zip_actions(trace_zip)
+
+    assert [e["type"] for e in events] == ["api_goto", "api_selectOption"]
+    assert events[0]["url"] == "https://app.envoice.eu/desktop/sale/add"
+    assert events[1]["selector"] == "select#currency"
+    assert events[1]["value"] == "EUR"
+
+
+def test_build_trace_summary_reads_only_max_lines_from_a_lazy_stream():
+    pulled = []
+
+    def events():
+        for idx in range(1000):
+            pulled.append(idx)
+            yield {"type": "api_click", "selector": f"#b{idx}"}
+
+    summary = build_trace_summary([], events(), max_lines=3)
+
+    assert summary.splitlines() == [
+        "001. api_click | selector=#b0",
+        "002. api_click | selector=#b1",
+        "003. api_click | selector=#b2",
+    ]
+    assert len(pulled) == 3
+
+
+def test_recorder_coalesces_typing_into_a_bounded_sink():
+    class FakeContext:
+        def expose_binding(self, name, callback):
+            self.emit = callback
+
+        def add_init_script(self, script):
+            pass
+
+    context = FakeContext()
+    sink = []
+    install_user_interaction_recorder(context, sink, max_events=4)
+
+    for value in ("A", "AC", "ACME"):
+        context.emit(None, {"type": "input", "selector": "#customer", "value": value})
+    context.emit(None, {"type": "input", "selector": "#amount", "value": "1"})
+    context.emit(None, {"type": "click", "selector": "#save"})
+    context.emit(None, "not-a-dict")
+    assert [e.get("value") for e in sink] == ["ACME", "1", None]
+
+    context.emit(None, {"type": "click", "selector": "#a"})
+    context.emit(None, {"type": "click", "selector": "#b"})
+    context.emit(None, {"type": "input", "selector": "#b", "value": "x"})
+    assert [e.get("value") or e["selector"] for e in sink] == ["ACME", "1", "#save", "#a"]
+